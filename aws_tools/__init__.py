@@ -1 +1,9 @@
-__version__ = "0.1.0"
\ No newline at end of file
+__version__ = "0.1.0"
+
+
+def __getattr__(name: str):
+    # exported lazily, so that importing a submodule does not load aiobotocore when it does not need it
+    if name == "warm_up_async":
+        from aws_tools._session import warm_up_async
+        return warm_up_async
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
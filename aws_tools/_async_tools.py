@@ -1,140 +1,235 @@
+import os
 import re
+import ast
+import copy
 import pathlib
-import inspect
 import asyncio
 import threading
 from types import ModuleType
-from typing import Awaitable, TypeVar, Callable, Any, AsyncIterable, Iterable
+from typing import Any, Coroutine, TypeVar, AsyncIterable, Iterable
 
 
 T = TypeVar("T")
+_ITER_BATCH_SIZE = 64  # maximum number of items fetched at once from an async iterator by its sync counterpart
+_ITER_QUEUE_SIZE = 1024  # maximum number of items produced in advance by an async iterator converted to sync
+_END_OF_ITERATION = (False, None)  # put in the queue when an async iterator converted to sync is exhausted
 
 
-def _run_async(coro: Awaitable[T]) -> T:
+_background_loop: asyncio.AbstractEventLoop | None = None
+_background_thread: threading.Thread | None = None
+_background_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the event loop running forever in a daemon thread,
+    starting it on first call so that its creation cost is paid only once
+    """
+    global _background_loop, _background_thread
+    with _background_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            # coroutines that complete without suspending are run to completion without going through the scheduler
+            loop.set_task_factory(asyncio.eager_task_factory)
+            thread = threading.Thread(target=loop.run_forever, name="aws_tools-event-loop", daemon=True)
+            thread.start()
+            _background_loop, _background_thread = loop, thread
+    return _background_loop
+
+
+def _reset_background_loop():
     """
-    Run coroutine safely even if already inside an event loop
+    Forget the background loop in a forked child process: its thread did not survive the fork,
+    so the child starts its own loop on next use
+    """
+    global _background_loop, _background_thread, _background_lock
+    _background_loop, _background_thread, _background_lock = None, None, threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_background_loop)
+
+
+def _raise_if_event_loop_running(coro: Coroutine | None = None):
+    """
+    Raises a RuntimeError if the current thread is running an event loop.
+    Blocking this thread would stall this loop, and deadlock if the awaited code depends on it.
+    The coroutine that would have been run, if any, is closed before raising.
     """
     try:
-        loop = asyncio.get_running_loop()
+        asyncio.get_running_loop()
     except RuntimeError:
-        loop = None
-    if loop and loop.is_running():
-        return asyncio.run_coroutine_threadsafe(coro, loop).result()
-    else:
-        return asyncio.run(coro)
+        return
+    if coro is not None:
+        coro.close()
+    raise RuntimeError("Sync wrappers cannot be called from within a running event loop, await the async function instead")
+
+
+def _run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run coroutine on the background event loop and wait for its result.
+    Raises a RuntimeError if called from a thread running an event loop.
+    """
+    _raise_if_event_loop_running(coro)
+    return asyncio.run_coroutine_threadsafe(coro, _get_background_loop()).result()
 
 
 def _async_iter_to_sync(async_iter: AsyncIterable[T]) -> Iterable[T]:
     """
     Converts an async iterator into a sync iterator
     """
-    loop = asyncio.new_event_loop()
-    thread = threading.Thread(target=loop.run_forever, daemon=True)
-    thread.start()
+    loop = _get_background_loop()
 
-    queue = asyncio.Queue(maxsize=1)
-    sentinel = object()  # put in the queue when an error is raised
-    exception_holder = []
+    # the queue contains (True, item) for yielded items, (False, exception) on error, and _END_OF_ITERATION
+    queue = asyncio.Queue(maxsize=_ITER_QUEUE_SIZE)
 
     async def produce():
         try:
             async for item in async_iter:
-                await queue.put(item)
+                if queue.full():
+                    await queue.put((True, item))
+                else:
+                    queue.put_nowait((True, item))
         except Exception as e:
-            exception_holder.append(e)
-        finally:
-            await queue.put(sentinel)
+            await queue.put((False, e))
+        else:
+            await queue.put(_END_OF_ITERATION)
+
+    async def get_batch() -> list[tuple[bool, T | Exception | None]]:
+        """
+        Wait for an item, then return it along with all items already available
+        """
+        batch = [await queue.get()]
+        while len(batch) < _ITER_BATCH_SIZE and batch[-1][0] and not queue.empty():
+            batch.append(queue.get_nowait())
+        return batch
 
-    asyncio.run_coroutine_threadsafe(produce(), loop)
+    producer = asyncio.run_coroutine_threadsafe(produce(), loop)
 
     def iterator():
         try:
+            _raise_if_event_loop_running()
             while True:
-                future = asyncio.run_coroutine_threadsafe(queue.get(), loop)
-                item = future.result()
-                if item is sentinel:
-                    if exception_holder:
-                        raise exception_holder[0]
-                    break
-                yield item
+                future = asyncio.run_coroutine_threadsafe(get_batch(), loop)
+                for is_item, value in future.result():
+                    if not is_item:
+                        if value is None:
+                            return
+                        raise value
+                    yield value
         finally:
-            loop.call_soon_threadsafe(loop.stop)
-            thread.join()
-            loop.close()
+            producer.cancel()
 
     return iterator()
 
 
-async def _sync_iter_to_async(sync_iter: Iterable[T]) -> AsyncIterable[T]:
+async def _sync_iter_to_async(sync_iter: Iterable[T], yield_every: int = 32) -> AsyncIterable[T]:
     """
-    Converts a synchrone iterable into an sync one
+    Converts a synchrone iterable into an async one,
+    giving back control to the event loop every 'yield_every' items
     """
-    for obj in sync_iter:
+    for i, obj in enumerate(sync_iter, start=1):
         yield obj
-        await asyncio.sleep(0)
+        if i % yield_every == 0:
+            await asyncio.sleep(0)
+
+
+_ASYNC_ITERATOR_TYPE = re.compile(r"\bAsync(Iterable|Iterator)\b")
+
+
+class _AsyncTypesToSync(ast.NodeTransformer):
+    """
+    Replace the async iterable type hints by their sync counterpart,
+    including in type hints written as strings
+    """
+
+    def visit_Name(self, node: ast.Name) -> ast.Name:
+        node.id = _ASYNC_ITERATOR_TYPE.sub(r"\1", node.id)
+        return node
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.Attribute:
+        node.attr = _ASYNC_ITERATOR_TYPE.sub(r"\1", node.attr)
+        return self.generic_visit(node)
+
+    def visit_Constant(self, node: ast.Constant) -> ast.Constant:
+        if isinstance(node.value, str):
+            node.value = _ASYNC_ITERATOR_TYPE.sub(r"\1", node.value)
+        return node
 
 
-def _function_definition_from_source(source: str) -> Iterable[str]:
+def _is_async_generator(async_func: ast.AsyncFunctionDef) -> bool:
     """
-    Recursively extract a function definition from source
+    Returns whether the function yields, ignoring nested function and class definitions
     """
-    open_parenthesis: int=0
-    characters = (c for c in source)
-    for c in characters:
-        yield c
-        if c == "(":
-            open_parenthesis += 1
-        elif c == ")":
-            open_parenthesis -= 1
-            if open_parenthesis == 0:
-                break
-    for c in characters:
-        yield c
-        if c == ":":
-            break
+    nodes = list(async_func.body)
+    while len(nodes) > 0:
+        node = nodes.pop()
+        if isinstance(node, (ast.Yield, ast.YieldFrom)):
+            return True
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+            nodes.extend(ast.iter_child_nodes(node))
+    return False
 
 
-def _generate_sync_wrapper_code(async_func: Callable[[Any], Awaitable[T]]) -> str:
+def _generate_sync_wrapper_code(async_func: ast.AsyncFunctionDef) -> str:
     """
     Returns a string representation of a sync function wrapper
-    around an async function, preserving the original type hints
-    exactly as written in the source file.
-    """
-    assert inspect.iscoroutinefunction(async_func) or inspect.isasyncgenfunction(async_func)
-    # Copy the function definition in format: "async def copy_object_async(obj: FileSystemObjectTypes, parent: FileSystemObjectTypes | None):"
-    source = "".join(_function_definition_from_source(inspect.getsource(async_func)))
-    source = source.replace("AsyncIterable", "Iterable").replace("AsyncIterator", "Iterator")
-    # Strip "async " from the front
-    signature_line = re.sub(r"^async\s+", "", source)
-    # Replace function name
-    func_name = async_func.__name__.removesuffix("_async")
-    signature_line = signature_line.replace(async_func.__name__, func_name, 1)
+    around an async function definition parsed from source,
+    preserving the original type hints.
+    """
+    args = async_func.args
+    if args.vararg is None:
+        call_args = [a.arg for a in args.posonlyargs] + [f"{a.arg}={a.arg}" for a in args.args]
+    else:
+        call_args = [a.arg for a in args.posonlyargs + args.args] + [f"*{args.vararg.arg}"]
+    call_args += [f"{a.arg}={a.arg}" for a in args.kwonlyargs]
+    if args.kwarg is not None:
+        call_args.append(f"**{args.kwarg.arg}")
+    call = f"{async_func.name}({', '.join(call_args)})"
+    if _is_async_generator(async_func):
+        body = f"return _async_iter_to_sync({call})"
+    else:
+        body = f"return _run_async({call})"
+    # Copy the function definition without the "async" keyword and decorators, and with the "_async" suffix removed from the name
+    fields = {field: getattr(async_func, field) for field in async_func._fields}
+    fields.update(
+        name=async_func.name.removesuffix("_async"),
+        body=ast.parse(body).body,
+        decorator_list=[],
+    )
+    wrapper = ast.FunctionDef(**copy.deepcopy(fields))
+    # Only the type hints are converted, default values are left untouched
+    to_sync = _AsyncTypesToSync()
+    for arg in (*wrapper.args.posonlyargs, *wrapper.args.args, wrapper.args.vararg, *wrapper.args.kwonlyargs, wrapper.args.kwarg):
+        if arg is not None and arg.annotation is not None:
+            arg.annotation = to_sync.visit(arg.annotation)
+    if wrapper.returns is not None:
+        wrapper.returns = to_sync.visit(wrapper.returns)
+    signature_line, body = ast.unparse(ast.fix_missing_locations(wrapper)).split("\n", 1)
     # Get docstring if present
-    doc = inspect.getdoc(async_func)
+    doc = ast.get_docstring(async_func)
     if (doc is not None) and len(doc.strip()) > 0:
         doc = '    """\n    ' + "\n    ".join(doc.split("\n")) + '\n    """\n'
     else:
         doc = ""
-    # Build wrapper body
-    if inspect.iscoroutinefunction(async_func):
-        body = f"return _run_async({async_func.__name__}({', '.join(p.name + '=' + p.name for p in inspect.signature(async_func).parameters.values())}))"
-    else:  # async generator
-        body = f"return _async_iter_to_sync({async_func.__name__}({', '.join(p.name + '=' + p.name for p in inspect.signature(async_func).parameters.values())}))"
 
-    return f"{signature_line}\n{doc}    {body}"
+    return f"{signature_line}\n{doc}{body}"
 
 
 def _generate_sync_module(module: ModuleType) -> str:
     """
     generate a sync module alongside
     """
-    code = ""
-    code += f"\"\"\"\nThis module was automatically generated from {module.__name__}\n\"\"\"\n"
-    code += f"from {__name__} import _run_async, _async_iter_to_sync, _sync_iter_to_async\n"
-    code += f"from typing import Iterable, Iterator\n"
-    code += f"from {module.__name__} import {', '.join(name for name, obj in vars(module).items())}\n"
-    for filter in (inspect.isasyncgenfunction, inspect.iscoroutinefunction):
-        for name, obj in inspect.getmembers(module, filter):
-            if not name.startswith("_") and obj.__code__.co_filename == module.__file__:
-                code += f"\n\n{_generate_sync_wrapper_code(obj)}\n"
-    return code
+    tree = ast.parse(pathlib.Path(module.__file__).read_text())
+    public_names = [name for name in vars(module) if not name.startswith("_")]
+    parts = [
+        f"\"\"\"\nThis module was automatically generated from {module.__name__}\n\"\"\"\n",
+        f"from {__name__} import _run_async, _async_iter_to_sync, _sync_iter_to_async\n",
+        f"from typing import Iterable, Iterator\n",
+    ]
+    if len(public_names) > 0:
+        parts.append(f"from {module.__name__} import {', '.join(public_names)}\n")
+    public_names = set(public_names)
+    for node in tree.body:
+        if isinstance(node, ast.AsyncFunctionDef) and node.name in public_names:
+            parts.append(f"\n\n{_generate_sync_wrapper_code(node)}\n")
+    return "".join(parts)
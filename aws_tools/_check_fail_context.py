@@ -6,6 +6,7 @@ class check_fail:
     Context that exit silently at the first error.
     If there was no error on leaving the context, raise one.
     """
+    __slots__ = ("exception_type",)
 
     def __init__(self, exception_type: Type[Exception] = Exception):
         self.exception_type = exception_type
@@ -14,7 +15,7 @@ class check_fail:
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        if isinstance(exc_value, self.exception_type):
+        if exc_type is not None and issubclass(exc_type, self.exception_type):
             return True
         elif exc_value is not None:
             raise exc_value
@@ -0,0 +1,36 @@
+import time
+import asyncio
+
+
+class _AsyncTokenBucket:
+    """
+    Rate limiter allowing on average 'rate' acquisitions per second,
+    with bursts of up to 'capacity' acquisitions
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if not rate > 0:
+            raise ValueError(f"Argument 'rate' must be strictly positive. got {rate}.")
+        if not capacity >= 1:
+            raise ValueError(f"Argument 'capacity' must be at least 1 for any acquisition to succeed. got {capacity}.")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    async def acquire(self):
+        """
+        Wait until a token is available, then consume it
+        """
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
@@ -0,0 +1,50 @@
+import asyncio
+from functools import cache
+from aiobotocore.session import get_session, AioSession
+from aiobotocore.config import AioConfig
+
+
+_CLIENT_CONFIG = AioConfig(
+    max_pool_connections=64,
+    retries={"max_attempts": 5, "mode": "adaptive"},
+    connect_timeout=3,
+    read_timeout=30,
+    tcp_keepalive=True,
+)
+
+_SHARED_DATA_FILES = ("endpoints", "partitions", "sdk-default-configuration")  # botocore data files read by any client creation
+_SERVICE_DATA_FILES = ("service-2", "endpoint-rule-set-1")  # botocore data files read by the creation of a client of a given service
+
+
+@cache
+def _get_shared_session() -> AioSession:
+    """
+    Returns the aiobotocore session shared by all clients,
+    so that credentials, configuration files and service models are loaded only once
+    """
+    return get_session()
+
+
+def _load_service_models(service_names: tuple[str, ...]):
+    """
+    Load the data files of the given services into the shared session loader cache
+    """
+    loader = _get_shared_session().get_component("data_loader")
+    for data_name in _SHARED_DATA_FILES:
+        loader.load_data(data_name)
+    for service_name in service_names:
+        for type_name in _SERVICE_DATA_FILES:  # sdk-extras files are merged in by the loader
+            loader.load_service_model(service_name, type_name)
+
+
+async def warm_up_async(*service_names: str):
+    """
+    Load the botocore data files shared by all clients and those of the given services in a worker thread.
+    Call this once at application startup, so that the first client creation
+    does not block the event loop while reading these files.
+
+    Example
+    -------
+    >>> await warm_up_async("ecs", "ecr", "firehose")
+    """
+    await asyncio.to_thread(_load_service_models, service_names)
@@ -1,4 +1,5 @@
-from collections import defaultdict
+import asyncio
+from functools import cache
 from typing import Any, Type, TypeVar, AsyncIterable
 from pydantic import BaseModel
 from aws_tools.bedrock.client import Bedrock
@@ -22,8 +23,10 @@ class AgentTool(BaseModel):
         raise NotImplementedError()
     
     @classmethod
+    @cache
     def definition(cls) -> ToolConfig.Tool:
         """
+        Returns the tool definition sent to the LLM, computed once per tool class
         """
         return ToolConfig.Tool(
             toolSpec=ToolConfig.Tool.ToolSpec(
@@ -55,6 +58,45 @@ class Agent:
         self.model_id = model_id
         self.system_prompt = system_prompt
 
+    @property
+    def system_prompt(self) -> str | None:
+        return self._system_prompt
+
+    @system_prompt.setter
+    def system_prompt(self, system_prompt: str | None):
+        """
+        Set the system prompt, building the system block sent with each request once
+        """
+        self._system_prompt = system_prompt
+        self._system = [BedrockSystemContentBlock(text=system_prompt)] if system_prompt is not None else None
+
+    def _validate_request(self, history: list[BedrockMessage], inference_config: BedrockInferenceConfig):
+        """
+        Validate the caller supplied parts of the request once, at the start of a conversation,
+        replacing in place the history messages by their validated models
+        """
+        request = BedrockConverseRequest(
+            modelId=self.model_id,
+            messages=history,
+            inferenceConfig=inference_config,
+            system=self._system,
+            toolConfig=self.tool_config
+        )
+        history[:] = request.messages
+
+    def _request(self, history: list[BedrockMessage], inference_config: BedrockInferenceConfig) -> BedrockConverseRequest:
+        """
+        Build the request of an agent turn without pydantic validation,
+        as the history was validated by '_validate_request' and the other parts are owned by the agent
+        """
+        return BedrockConverseRequest.model_construct(
+            modelId=self.model_id,
+            messages=history,
+            inferenceConfig=inference_config,
+            system=self._system,
+            toolConfig=self.tool_config
+        )
+
     @classmethod
     def register_tool(cls, new_tool: T) -> T:
         """
@@ -66,21 +108,16 @@ class Agent:
         )
         return new_tool
 
-    async def converse_async(self, history: list[BedrockMessage], inference_config: BedrockInferenceConfig = BedrockInferenceConfig(), tool_secrets: dict[str, dict]=defaultdict(dict)) -> tuple[list[BedrockMessage], BedrockConverseResponse.TokenUsage]:
+    async def converse_async(self, history: list[BedrockMessage], inference_config: BedrockInferenceConfig = BedrockInferenceConfig(), tool_secrets: dict[str, dict] | None = None) -> tuple[list[BedrockMessage], BedrockConverseResponse.TokenUsage]:
         """
         Returns a response from the LLM.
         """
         inference_config = inference_config.model_copy()
+        self._validate_request(history, inference_config)
         token_usage = BedrockConverseResponse.TokenUsage(inputTokens=0, outputTokens=0, totalTokens=0)
         new_messages = 0
         while True:
-            payload = BedrockConverseRequest(
-                modelId=self.model_id,
-                messages=history,
-                inferenceConfig=inference_config,
-                system=[BedrockSystemContentBlock(text=self.system_prompt)] if self.system_prompt is not None else None,
-                toolConfig=self.tool_config
-            )
+            payload = self._request(history, inference_config)
             response = await self.bedrock_client.converse_async(payload)
             new_messages+=1;history.append(response.output.message)
             token_usage += response.usage
@@ -89,23 +126,18 @@ class Agent:
                 inference_config.maxTokens -= response.usage.outputTokens
             if len(tool_uses) == 0 or (inference_config is not None and inference_config.maxTokens <= 0):
                 break
-            new_messages+=1;history.append(BedrockMessage(role="user", content=[BedrockContentBlock(toolResult=self._call_tool_async(tool, tool_secrets)) for tool in tool_uses]))
+            new_messages+=1;history.append(await self._call_tools_async(tool_uses, tool_secrets))
         return history[-new_messages:], token_usage
 
-    async def converse_stream(self, history: list[BedrockMessage], inference_config: BedrockInferenceConfig = BedrockInferenceConfig(), tool_secrets: dict[str, dict]=defaultdict(dict)) -> AsyncIterable[BedrockConverseStreamEventResponse.ContentBlockDeltaEvent.ContentBlockDelta | BedrockConverseResponse.TokenUsage]:
+    async def converse_stream(self, history: list[BedrockMessage], inference_config: BedrockInferenceConfig = BedrockInferenceConfig(), tool_secrets: dict[str, dict] | None = None) -> AsyncIterable[BedrockConverseStreamEventResponse.ContentBlockDeltaEvent.ContentBlockDelta | BedrockConverseResponse.TokenUsage]:
         """
         Stream the response from the LLM, then finally yield the total token usage
         """
         inference_config = inference_config.model_copy()
+        self._validate_request(history, inference_config)
         token_usage = BedrockConverseResponse.TokenUsage(inputTokens=0, outputTokens=0, totalTokens=0)
         while True:
-            payload = BedrockConverseRequest(
-                modelId=self.model_id,
-                messages=history,
-                inferenceConfig=inference_config,
-                system=[BedrockSystemContentBlock(text=self.system_prompt)] if self.system_prompt is not None else None,
-                toolConfig=self.tool_config
-            )
+            payload = self._request(history, inference_config)
             async for event in self.bedrock_client.converse_stream(payload):
                 if isinstance(event, BedrockConverseStreamEventResponse.ContentBlockDeltaEvent.ContentBlockDelta):
                     yield event
@@ -116,17 +148,25 @@ class Agent:
                 inference_config.maxTokens -= event.usage.outputTokens
             if len(tool_uses) == 0 or (inference_config is not None and inference_config.maxTokens <= 0):
                 break
-            history.append(BedrockMessage(role="user", content=[BedrockContentBlock(toolResult=await self._call_tool_async(tool, tool_secrets)) for tool in tool_uses]))
+            history.append(await self._call_tools_async(tool_uses, tool_secrets))
         yield token_usage 
 
-    async def _call_tool_async(self, tool_use: BedrockContentBlock.ToolUse, tool_secrets: dict[str, dict]) -> BedrockContentBlock.ToolResult:
+    async def _call_tools_async(self, tool_uses: list[BedrockContentBlock.ToolUse], tool_secrets: dict[str, dict] | None) -> BedrockMessage:
+        """
+        Call concurrently all the tools requested in a message and return the user message with the tool results
+        """
+        results = await asyncio.gather(*(self._call_tool_async(tool_use, tool_secrets) for tool_use in tool_uses))
+        return BedrockMessage(role="user", content=[BedrockContentBlock(toolResult=result) for result in results])
+
+    async def _call_tool_async(self, tool_use: BedrockContentBlock.ToolUse, tool_secrets: dict[str, dict] | None) -> BedrockContentBlock.ToolResult:
         """
         Call the request tool and return the tool result object
         """
+        tool_secrets = tool_secrets or {}
         try:
             Tool = self.tools[tool_use.name]
             tool = Tool(**tool_use.input)
-            result = await tool(**tool_secrets[tool_use.name])
+            result = await tool(**tool_secrets.get(tool_use.name, {}))
         except Exception as e:
             return BedrockContentBlock.ToolResult(
                 content=[
@@ -32,13 +32,13 @@ class Bedrock:
         await self.close()
 
     async def converse_async(self, payload: BedrockConverseRequest) -> BedrockConverseResponse:
-        return BedrockConverseResponse(**await self._client.converse(**payload.model_dump(mode="python", exclude_none=True, by_alias=True)))
+        return BedrockConverseResponse(**await self._client.converse(**payload.dump))
 
     async def converse_stream(self, payload: BedrockConverseRequest) -> AsyncIterable[BedrockConverseStreamEventResponse.ContentBlockDeltaEvent.ContentBlockDelta | BedrockConverseResponse]:
         """
         Stream the LLM text answer to a request, then finally yield the complete response object
         """
-        response = await self._client.converse_stream(**payload.model_dump(mode="python", exclude_none=True, by_alias=True))
+        response = await self._client.converse_stream(**payload.dump)
         message_start: BedrockConverseStreamEventResponse.MessageStartEvent | None = None
         block_content_by_index: dict[int, BedrockContentBlock] = {}
         block_delta_by_index: dict[int, list[BedrockConverseStreamEventResponse.ContentBlockDeltaEvent.ContentBlockDelta]] = {}
@@ -1,5 +1,5 @@
 import json
-from base64 import b64decode, b64encode
+from binascii import a2b_base64, b2a_base64
 from json.decoder import JSONDecodeError
 from typing import Literal, Any, Annotated, TypeVar, Self, Union
 from pydantic import BaseModel, Field, BeforeValidator, SerializerFunctionWrapHandler, SerializationInfo
@@ -11,11 +11,18 @@ def base64_serializer(value: bytes, handler: SerializerFunctionWrapHandler, info
     Serialize bytes as base64 string for "json" dump mode, keep as bytes for "python" dump mode
     """
     if info.mode == "json":
-        return b64encode(value).decode()
+        return b2a_base64(value, newline=False).decode("ascii")
     else:
         return value
 
 
+def base64_validator(value: str | bytes) -> bytes:
+    """
+    Decode base64 strings into bytes, pass bytes through untouched
+    """
+    return a2b_base64(value) if type(value) is str else value
+
+
 A = TypeVar("A")
 
 
@@ -30,7 +37,7 @@ def _add_nullables(x: A | None, y: A | None, zero: A) -> A | None:
 Base64Bytes = Annotated[
     bytes,
     WrapSerializer(base64_serializer, return_type=bytes | str),
-    BeforeValidator(lambda x: b64decode(x) if isinstance(x, str) else x)
+    BeforeValidator(base64_validator)
 ]
 
 
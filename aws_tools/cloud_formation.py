@@ -1,4 +1,6 @@
-from aiobotocore.session import get_session, AioBaseClient
+import asyncio
+from aiobotocore.session import AioBaseClient
+from aws_tools._session import _get_shared_session, _CLIENT_CONFIG
 
 
 class CloudFormation:
@@ -14,11 +16,11 @@ class CloudFormation:
     """
 
     def __init__(self):
-        self.session = get_session()
+        self.session = _get_shared_session()
         self._client: AioBaseClient | None = None
 
     async def open(self):
-        self._client = await self.session.create_client("cloudformation").__aenter__()
+        self._client = await self.session.create_client("cloudformation", config=_CLIENT_CONFIG).__aenter__()
 
     async def close(self):
         await self._client.__aexit__(None, None, None)
@@ -44,30 +46,33 @@ class CloudFormation:
         list existing stacks
         """
         stack_names = []
-        results = await self.client.list_stacks()
-        while True:
-            stack_names.extend([stack["StackName"] for stack in results["StackSummaries"]
-                                if stack["StackStatus"] in ["CREATE_COMPLETE", "UPDATE_COMPLETE", "UPDATE_ROLLBACK_COMPLETE"]
-                                and stack["StackName"] not in stack_names])
-            next_token = results.get("NextToken")
-            if next_token is None:
-                break
-            else:
-                results = await self.client.list_stacks(NextToken=next_token)
+        seen = set()
+        paginator = self.client.get_paginator("list_stacks")
+        async for page in paginator.paginate(StackStatusFilter=["CREATE_COMPLETE", "UPDATE_COMPLETE", "UPDATE_ROLLBACK_COMPLETE"]):
+            for stack in page["StackSummaries"]:
+                if stack["StackName"] not in seen:
+                    seen.add(stack["StackName"])
+                    stack_names.append(stack["StackName"])
         return stack_names
 
 
-    async def get_stack_outputs_async(self, stack: str | None = None) -> dict[str, str]:
+    async def get_stack_outputs_async(self, stack: str | None = None, max_concurrent_requests: int = 20) -> dict[str, str]:
         """
-        Returns the exported stack outputs. Or all the outputs of all stacks
+        Returns the exported stack outputs. Or all the outputs of all stacks.
+        Stacks are described concurrently, with at most 'max_concurrent_requests' requests at once.
         """
         if stack is None:
             stacks = await self.list_stacks_async()
         else:
             stacks = [stack]
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+        async def describe_stack(stack_name: str) -> dict:
+            async with semaphore:
+                return await self.client.describe_stacks(StackName=stack_name)
+
         stack_outputs = {}
-        for stack_name in stacks:
-            descriptions = await self.client.describe_stacks(StackName=stack_name)
+        for descriptions in await asyncio.gather(*[describe_stack(stack_name) for stack_name in stacks]):
             stack = descriptions['Stacks'][0]
             for output in stack.get('Outputs', []):
                 stack_outputs[output["OutputKey"]] = output["OutputValue"]
@@ -1,4 +1,5 @@
-from aiobotocore.session import get_session, AioBaseClient
+from aiobotocore.session import AioBaseClient
+from aws_tools._session import _get_shared_session, _CLIENT_CONFIG
 from botocore.exceptions import ClientError
 from typing import Literal
 
@@ -16,11 +17,11 @@ class Cognito:
     """
 
     def __init__(self):
-        self.session = get_session()
+        self.session = _get_shared_session()
         self._client: AioBaseClient | None = None
 
     async def open(self):
-        self._client = await self.session.create_client("cognito-idp").__aenter__()
+        self._client = await self.session.create_client("cognito-idp", config=_CLIENT_CONFIG).__aenter__()
 
     async def close(self):
         await self._client.__aexit__(None, None, None)
@@ -90,7 +91,7 @@ class Cognito:
         await self.client.respond_to_auth_challenge(
             ClientId=pool_client,
             ChallengeName='SMS_MFA',
-            Session=self.session,
+            Session=session_token,
             ChallengeResponses={'SMS_MFA_CODE': mfa_code, 'USERNAME': user}
         )
 
@@ -1,5 +1,8 @@
-from aiobotocore.session import get_session, AioBaseClient
+import asyncio
+from aiobotocore.session import AioBaseClient
+from aws_tools._session import _get_shared_session, _CLIENT_CONFIG
 from datetime import datetime
+from typing import AsyncIterable
 
 
 class ElasticContainerRegistry:
@@ -15,11 +18,11 @@ class ElasticContainerRegistry:
     """
 
     def __init__(self):
-        self.session = get_session()
+        self.session = _get_shared_session()
         self._client: AioBaseClient | None = None
 
     async def open(self):
-        self._client = await self.session.create_client("ecr").__aenter__()
+        self._client = await self.session.create_client("ecr", config=_CLIENT_CONFIG).__aenter__()
 
     async def close(self):
         await self._client.__aexit__(None, None, None)
@@ -39,23 +42,45 @@ class ElasticContainerRegistry:
         else:
             return self._client
 
+    async def iter_repositories_async(self) -> AsyncIterable[str]:
+        """
+        Yield all existing repository names, page by page
+        """
+        paginator = self.client.get_paginator('describe_repositories')
+        async for page in paginator.paginate():
+            for repo in page['repositories']:
+                yield repo["repositoryName"]
+
+
     async def list_repositories_async(self) -> list[str]:
         """
         Return all existing repository names
         """
-        paginator = self.client.get_paginator('describe_repositories')
-        return [repo["repositoryName"] async for page in paginator.paginate() for repo in page['repositories']]
+        return [name async for name in self.iter_repositories_async()]
+
+
+    async def iter_image_tags_async(self, repository_name: str) -> AsyncIterable[tuple[str, datetime]]:
+        """
+        Yield (tag, image_pushed_timestamp) tuples, page by page
+        """
+        request = asyncio.create_task(self.client.describe_images(repositoryName=repository_name))
+        try:
+            while request is not None:
+                page = await request
+                # request the next page before processing the current one
+                next_token = page.get("nextToken")
+                request = None if next_token is None else asyncio.create_task(self.client.describe_images(repositoryName=repository_name, nextToken=next_token))
+                for image in page["imageDetails"]:
+                    pushed_at = image["imagePushedAt"]
+                    for tag in image.get("imageTags", []):
+                        yield tag, pushed_at
+        finally:
+            if request is not None:
+                request.cancel()
 
 
     async def list_image_tags_async(self, repository_name: str) -> dict[str, datetime]:
         """
         Return a dict of {tag: image_pushed_timestamp}
         """
-        paginator = self.client.get_paginator("describe_images")
-        results = {}
-        async for page in paginator.paginate(repositoryName=repository_name):
-            for image in page["imageDetails"]:
-                pushed_at = image["imagePushedAt"]
-                for tag in image.get("imageTags", []):
-                    results[tag] = pushed_at
-        return results
+        return {tag: pushed_at async for tag, pushed_at in self.iter_image_tags_async(repository_name)}
@@ -1,10 +1,19 @@
+import os
+import asyncio
+from itertools import islice
 from datetime import datetime
-from pydantic import BaseModel, Field
-from aiobotocore.session import get_session, AioBaseClient
+from pydantic import BaseModel, Field, TypeAdapter
+from aiobotocore.session import AioBaseClient
+from aws_tools._session import _get_shared_session, _CLIENT_CONFIG
+from aws_tools._rate_limiter import _AsyncTokenBucket
 from typing import Literal, Iterable, AsyncIterable, Optional
 from botocore.exceptions import ClientError
 
 
+_PARSE_IN_THREAD_THRESHOLD = 16  # number of task descriptions above which they are parsed in a worker thread
+_FARGATE_CPU_UNITS = {"0.25": 256, 0.25: 256, "0.5": 512, 0.5: 512, 1: 1024, 2: 2048, 4: 4096, 8: 8192, 16: 16384, 32: 32768}
+_TASK_NOT_FOUND_ERROR_CODES = frozenset({"InvalidParameterException", "TaskNotFound", "ClusterNotFoundException"})
+_RUN_TASK_RATE_LIMIT_VARIABLE = "AWS_TOOLS_RUN_TASK_RATE_LIMIT"  # environment variable giving the default rate limit of fargate task launches per second
 TASK_STATUSES = Literal["PROVISIONING", "PENDING", "RUNNING", "DEPROVISIONING", "STOPPED", "ACTIVATING"]
 
 
@@ -88,6 +97,8 @@ class Overrides(BaseModel):
 
 
 ECSTaskStatus = Literal["PROVISIONING", "PENDING", "ACTIVATING", "RUNNING", "DEACTIVATING", "STOPPING", "DEPROVISIONING", "STOPPED", "DELETED"]
+_STARTING_STATUSES: frozenset[ECSTaskStatus] = frozenset({"PROVISIONING", "PENDING", "ACTIVATING"})
+_STOPPING_STATUSES: frozenset[ECSTaskStatus] = frozenset({"DEACTIVATING", "STOPPING", "DEPROVISIONING"})
 
 
 class ECSTask(BaseModel):
@@ -162,26 +173,21 @@ class ECSTaskDescription(ECSTask):
     fargateEphemeralStorage: StorageSize | None = None
 
     def is_starting(self) -> bool:
-        return self.lastStatus in {
-            "PROVISIONING",
-            "PENDING",
-            "ACTIVATING",
-        }
+        return self.lastStatus in _STARTING_STATUSES
 
     def is_running(self) -> bool:
         return self.lastStatus == "RUNNING"
 
     def is_stopping(self) -> bool:
-        return self.lastStatus in {
-            "DEACTIVATING",
-            "STOPPING",
-            "DEPROVISIONING",
-        }
+        return self.lastStatus in _STOPPING_STATUSES
 
     def is_stopped(self) -> bool:
         return self.lastStatus == "STOPPED"
 
 
+_TASK_DESCRIPTIONS_ADAPTER = TypeAdapter(list[ECSTaskDescription])
+
+
 class ECSTaskDefinition(BaseModel):
     taskDefinitionArn: str
     family: str
@@ -211,14 +217,22 @@ class ElasticContainerService:
     It can also be used as an async context
     >>> async with ElasticContainerService() as ecs:
     >>>     ...
+
+    If 'run_task_rate_limit' is given, tasks started with 'run_fargate_task_async' are limited to this many per second on average,
+    to smooth bursts of launches below the RunTask API throttling. It defaults to the AWS_TOOLS_RUN_TASK_RATE_LIMIT
+    environment variable if set, and otherwise no limit is applied.
+    The limit applies to the launches of this instance only, not across instances or processes sharing the account quota.
     """
 
-    def __init__(self):
-        self.session = get_session()
+    def __init__(self, run_task_rate_limit: float | None = None):
+        self.session = _get_shared_session()
         self._client: AioBaseClient | None = None
+        if run_task_rate_limit is None and _RUN_TASK_RATE_LIMIT_VARIABLE in os.environ:
+            run_task_rate_limit = float(os.environ[_RUN_TASK_RATE_LIMIT_VARIABLE])
+        self._run_task_rate_limiter = None if run_task_rate_limit is None else _AsyncTokenBucket(rate=run_task_rate_limit, capacity=max(1.0, run_task_rate_limit))
 
     async def open(self):
-        self._client = await self.session.create_client("ecs").__aenter__()
+        self._client = await self.session.create_client("ecs", config=_CLIENT_CONFIG).__aenter__()
 
     async def close(self):
         await self._client.__aexit__(None, None, None)
@@ -257,18 +271,22 @@ class ElasticContainerService:
         Run a standalone task on an ECS cluster.
         Returns the running task arn.
         """
-        assert (disk_GiB_override is None) or (20 <= disk_GiB_override <= 200)
-        container_overrides = {
-            "name": main_image_name,
-            "cpu": int(round(float(vCPU_override) * 1024)) if vCPU_override is not None else None,
-            "memory": memory_MiB_override,
-            "environment": [{"name": k, "value": v} for k, v in env_overrides.items()] if env_overrides is not None else None
-        }
-        container_overrides = {k : v for k, v in container_overrides.items() if v is not None}
+        if disk_GiB_override is not None and not (20 <= disk_GiB_override <= 200):
+            raise ValueError(f"Argument 'disk_GiB_override' must be between 20 and 200 as per fargate limitation. got {disk_GiB_override}.")
+        container_overrides = {"name": main_image_name}
+        if vCPU_override is not None:
+            cpu_units = _FARGATE_CPU_UNITS.get(vCPU_override)
+            if cpu_units is None:
+                raise ValueError(f"Argument 'vCPU_override' must be one of {list(_FARGATE_CPU_UNITS.keys())} as per fargate limitation. got {vCPU_override!r}.")
+            container_overrides["cpu"] = cpu_units
+        if memory_MiB_override is not None:
+            container_overrides["memory"] = memory_MiB_override
+        if env_overrides:
+            container_overrides["environment"] = [{"name": k, "value": v} for k, v in env_overrides.items()]
         overrides = {}
-        if disk_GiB_override > 20:
+        if disk_GiB_override is not None and disk_GiB_override > 20:
             overrides["ephemeralStorage"] = {"sizeInGiB": disk_GiB_override}
-        if len(container_overrides.keys()) > 1:
+        if len(container_overrides) > 1:
             overrides["containerOverrides"] = [container_overrides]
         kwargs = dict(
             cluster=cluster_name,
@@ -285,8 +303,10 @@ class ElasticContainerService:
             },
             tags=[{"key": k, "value": v} for k, v in tags.items()]
         )
-        if len(overrides.keys()) > 0:
-            kwargs["overrides"] = overrides=overrides
+        if len(overrides) > 0:
+            kwargs["overrides"] = overrides
+        if self._run_task_rate_limiter is not None:
+            await self._run_task_rate_limiter.acquire()
         response = await self.client.run_task(**kwargs)
         return ECSTask(**response["tasks"][0])
 
@@ -304,31 +324,83 @@ class ElasticContainerService:
             )
         except ClientError as e:
             error = e.response["Error"]
-            if (error["Code"] == "InvalidParameterException") and ("The referenced task was not found" in error["Message"]):
+            if (error["Code"] in _TASK_NOT_FOUND_ERROR_CODES) and ("not found" in error["Message"].lower()):
                 return False
             else:
                 raise
         return True
 
 
-    async def get_tasks_async(self, cluster_name: str, task_arns: list[str], chunk_size: int=100) -> dict[str, ECSTaskDescription]:
+    async def _describe_tasks_async(self, cluster_name: str, task_arns: Iterable[str], chunk_size: int=100, max_concurrent_requests: int=10) -> dict[str, dict]:
+        """
+        Returns the raw description of the given tasks by task arn, by querying aws by batch.
+        Batches are queried concurrently, with at most 'max_concurrent_requests' requests at once.
+        """
+        if chunk_size > 100:
+            raise ValueError(f"Argument 'chunk_size' must not be greater than 100 as per ecs limitation. got {chunk_size}.")
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+        async def describe_tasks(arns: list[str]) -> list[dict]:
+            async with semaphore:
+                response = await self.client.describe_tasks(cluster=cluster_name, tasks=arns, include=["TAGS"])
+            return response["tasks"]
+
+        iterator = iter(task_arns)
+        chunks = []
+        while chunk := list(islice(iterator, chunk_size)):
+            chunks.append(chunk)
+        responses = await asyncio.gather(*[describe_tasks(chunk) for chunk in chunks])
+        return {task["taskArn"]: task for tasks in responses for task in tasks}
+
+
+    async def get_tasks_async(self, cluster_name: str, task_arns: list[str], chunk_size: int=100, max_concurrent_requests: int=10) -> dict[str, ECSTaskDescription]:
         """
         Returns the description of the given tasks, by querying aws by batch.
+        Tasks that do not exist are missing from the returned dict.
         """
-        subset_arns = [task_arns[i:i+chunk_size] for i in range(0, chunk_size)]
-        response = []
-        for arns in await subset_arns:
-            response.extend(await self.client.describe_tasks(cluster=cluster_name, tasks=arns, include=["TAGS"])["tasks"])
-        descriptions = {task["taskArn"]: task for task in response}
-        return {arn: ECSTaskDescription(**descriptions[arn]) for arn in task_arns if arn in descriptions.keys()}
+        descriptions = await self._describe_tasks_async(cluster_name, task_arns, chunk_size, max_concurrent_requests)
+
+        def parse() -> dict[str, ECSTaskDescription]:
+            tasks = _TASK_DESCRIPTIONS_ADAPTER.validate_python([descriptions[arn] for arn in task_arns if arn in descriptions.keys()])
+            return {task.taskArn: task for task in tasks}
+
+        if len(descriptions) >= _PARSE_IN_THREAD_THRESHOLD:
+            return await asyncio.to_thread(parse)
+        return parse()
+
+
+    async def get_tasks_statuses_async(self, cluster_name: str, task_arns: list[str], chunk_size: int=100, max_concurrent_requests: int=10) -> dict[str, ECSTaskStatus]:
+        """
+        Returns the last status of the given tasks, without parsing their full description.
+        Tasks that do not exist are missing from the returned dict.
+        """
+        descriptions = await self._describe_tasks_async(cluster_name, task_arns, chunk_size, max_concurrent_requests)
+        return {arn: descriptions[arn]["lastStatus"] for arn in task_arns if arn in descriptions.keys()}
+
+
+    async def _describe_task_async(self, cluster_name: str, task_arn: str) -> dict | None:
+        """
+        Returns the raw description of a single task, or None if it does not exist
+        """
+        response = await self.client.describe_tasks(cluster=cluster_name, tasks=[task_arn], include=["TAGS"])
+        tasks = response["tasks"]
+        return tasks[0] if tasks else None
 
 
     async def get_task_async(self, cluster_name: str, task_arn: str) -> ECSTaskDescription | None:
         """
         Returns the description of the given task
         """
-        tasks = await self.get_tasks_async(cluster_name, [task_arn])
-        return tasks.get(task_arn)
+        description = await self._describe_task_async(cluster_name, task_arn)
+        return None if description is None else ECSTaskDescription.model_validate(description)
+
+
+    async def get_task_status_async(self, cluster_name: str, task_arn: str) -> ECSTaskStatus | None:
+        """
+        Returns the last status of the given task, or None if it does not exist
+        """
+        description = await self._describe_task_async(cluster_name, task_arn)
+        return None if description is None else description["lastStatus"]
 
 
     async def get_task_definition_async(self, task_definition: str) -> ECSTaskDefinition:
@@ -1,5 +1,17 @@
-import json
-from aiobotocore.session import get_session, AioBaseClient
+import random
+import asyncio
+from typing import Iterable, Callable, Awaitable
+from pydantic_core import to_json
+from aiobotocore.session import AioBaseClient
+from aws_tools._session import _get_shared_session, _CLIENT_CONFIG
+
+
+MAX_BATCH_RECORDS = 500  # maximum number of records in a 'put_record_batch' call
+MAX_BATCH_BYTES = 4 * 1024**2  # maximum total size of the records in a 'put_record_batch' call
+MAX_RECORD_BYTES = 1000 * 1024  # maximum size of a single firehose record
+_BATCH_MAX_ATTEMPTS = 8  # maximum number of 'put_record_batch' calls for the same records before giving up
+_RETRY_BASE_DELAY = 0.1  # delay in seconds before the first retry of failed records, doubled at each attempt
+_RETRY_MAX_DELAY = 5.0  # maximum delay in seconds between two retries of failed records
 
 
 class Firehose:
@@ -15,11 +27,11 @@ class Firehose:
     """
 
     def __init__(self):
-        self.session = get_session()
+        self.session = _get_shared_session()
         self._client: AioBaseClient | None = None
 
     async def open(self):
-        self._client = await self.session.create_client("firehose").__aenter__()
+        self._client = await self.session.create_client("firehose", config=_CLIENT_CONFIG).__aenter__()
 
     async def close(self):
         await self._client.__aexit__(None, None, None)
@@ -46,6 +58,77 @@ class Firehose:
         await self.client.put_record(
             DeliveryStreamName=firehose_stream,
             Record={
-                "Data": json.dumps(serialisable)+"\n"
+                "Data": to_json(serialisable) + b"\n"
             }
         )
+
+    def make_firehose_writer(self, firehose_stream: str, static_fields: dict) -> Callable[[dict], Awaitable[None]]:
+        """
+        Returns an async function that saves json objects made of the given static fields
+        and of the fields passed to it, to a firehose stream.
+        The static fields are serialized only once. The fields passed to the writer must not repeat them,
+        otherwise a ValueError is raised, as the spliced json object would contain duplicate keys.
+
+        Example
+        -------
+        >>> write_async = f.make_firehose_writer("my-stream", {"service": "api", "version": 3})
+        >>> await write_async({"event": "login", "user": "bob"})
+        """
+        static = to_json(static_fields)
+        prefix = static[:-1] + b"," if len(static_fields) > 0 else b"{"
+        static_keys = frozenset(static_fields)
+
+        async def write_async(fields: dict):
+            if not static_keys.isdisjoint(fields):
+                raise ValueError(f"Fields {sorted(static_keys.intersection(fields))} are already static fields of the firehose writer.")
+            data = (prefix + to_json(fields)[1:] if len(fields) > 0 else static) + b"\n"
+            await self.client.put_record(
+                DeliveryStreamName=firehose_stream,
+                Record={
+                    "Data": data
+                }
+            )
+
+        return write_async
+
+    async def batch_save_to_firehose_async(self, serialisables: Iterable[dict | list | str | int | float | None], firehose_stream: str, chunk_size: int=MAX_BATCH_RECORDS):
+        """
+        Save json serialisables to a firehose stream,
+        by batches of at most 'chunk_size' records (and at most 4 MiB), retrying failed records
+        """
+        if chunk_size > MAX_BATCH_RECORDS:
+            raise ValueError(f"Argument 'chunk_size' must not be greater than {MAX_BATCH_RECORDS} as per firehose limitation. got {chunk_size}.")
+        if chunk_size <= 0:
+            raise ValueError(f"Argument 'chunk_size' must be strictly positive. got {chunk_size}.")
+        batch: list[bytes] = []
+        batch_bytes = 0
+        for serialisable in serialisables:
+            data = to_json(serialisable) + b"\n"
+            if len(data) > MAX_RECORD_BYTES:
+                raise ValueError(f"Serialized records must not be larger than {MAX_RECORD_BYTES} bytes as per firehose limitation. got {len(data)}.")
+            if len(batch) > 0 and (len(batch) >= chunk_size or batch_bytes + len(data) > MAX_BATCH_BYTES):
+                await self._put_record_batch_async(batch, firehose_stream)
+                batch, batch_bytes = [], 0
+            batch.append(data)
+            batch_bytes += len(data)
+        if len(batch) > 0:
+            await self._put_record_batch_async(batch, firehose_stream)
+
+    async def _put_record_batch_async(self, records: list[bytes], firehose_stream: str):
+        """
+        Send the records in a single batch call, then retry the records that failed,
+        with exponential backoff and jitter, for at most _BATCH_MAX_ATTEMPTS calls
+        """
+        for attempt in range(_BATCH_MAX_ATTEMPTS):
+            if attempt > 0:
+                await asyncio.sleep(random.uniform(0, min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2**(attempt - 1))))
+            response = await self.client.put_record_batch(
+                DeliveryStreamName=firehose_stream,
+                Records=[{"Data": data} for data in records]
+            )
+            if response["FailedPutCount"] == 0:
+                return
+            failed = [(data, result["ErrorCode"]) for data, result in zip(records, response["RequestResponses"]) if "ErrorCode" in result]
+            records = [data for data, _ in failed]
+        error_codes = sorted({error_code for _, error_code in failed})
+        raise RuntimeError(f"Failed to put {len(records)} records to firehose stream '{firehose_stream}' after {_BATCH_MAX_ATTEMPTS} attempts, with error codes {error_codes}")
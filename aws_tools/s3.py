@@ -2,9 +2,45 @@ import os
 import pathlib
 import asyncio
 import aioboto3
-from urllib.parse import urlparse
-from typing import Iterable, Callable, Optional, AsyncIterable
+from urllib.parse import urlencode
+from typing import Iterable, Callable, Optional, AsyncIterable, BinaryIO
 from botocore.exceptions import ClientError
+from boto3.s3.transfer import TransferConfig
+from aiobotocore.config import AioConfig
+from aws_tools._session import _CLIENT_CONFIG
+
+
+_S3_CLIENT_CONFIG = _CLIENT_CONFIG.merge(AioConfig(retries={"max_attempts": 10, "mode": "adaptive"}, signature_version="s3v4"))
+_NOT_FOUND_ERROR_CODES = frozenset({"404", "NoSuchBucket", "NoSuchKey"})
+_HEAD_CHECK_MAX_FILES = 10  # number of uploaded files above which the overwrite check lists the prefix instead of heading each key
+_MULTIPART_COPY_THRESHOLD = 100 * 1024**2  # object size above which copies are made by concurrent part copies
+_MULTIPART_COPY_PART_SIZE = 50 * 1024**2
+# object headers returned by 'head_object' that 'copy_object' keeps, and that multipart copies must set explicitly
+_COPIED_OBJECT_HEADERS = (
+    "ContentType", "ContentEncoding", "ContentDisposition", "ContentLanguage", "CacheControl", "Expires",
+    "Metadata", "ServerSideEncryption", "SSEKMSKeyId", "BucketKeyEnabled",
+)
+_RANGED_GET_PART_SIZE = 8 * 1024**2  # size of the byte ranges downloaded concurrently by 'download_data_async'
+_MULTIPART_UPLOAD_PART_SIZE = 50 * 1024**2
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=50 * 1024**2,
+    multipart_chunksize=50 * 1024**2,
+    max_concurrency=20,
+    io_chunksize=1024**2,
+    use_threads=True,
+)
+
+
+def _iter_files(directory: str) -> Iterable[str]:
+    """
+    Yield the path of all files in a directory and its subdirectories, without following symlinks to directories
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                yield entry.path
+            elif not entry.is_symlink():
+                yield from _iter_files(entry.path)
 
 
 class S3Exception(Exception):
@@ -23,8 +59,8 @@ class S3:
         self._resource = None
 
     async def open(self):
-        self._client = await self.session.client("s3", region_name=self._region).__aenter__()
-        self._resource = await self.session.resource("s3", region_name=self._region).__aenter__()
+        self._client = await self.session.client("s3", region_name=self._region, config=_S3_CLIENT_CONFIG).__aenter__()
+        self._resource = await self.session.resource("s3", region_name=self._region, config=_S3_CLIENT_CONFIG).__aenter__()
 
     async def close(self):
         await self._client.__aexit__(None, None, None)
@@ -93,7 +129,7 @@ class S3:
             await self.client.head_bucket(Bucket=bucket_name)
         except ClientError as e:
             error_code = e.response["Error"]["Code"]
-            if error_code in ["404", "NoSuchBucket"]:
+            if error_code in _NOT_FOUND_ERROR_CODES:
                 return False
             else:
                 raise
@@ -108,7 +144,7 @@ class S3:
             obj = await self.resource.Object(bucket_name, key)
             await obj.load()
         except ClientError as e:
-            if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+            if e.response["Error"]["Code"] in _NOT_FOUND_ERROR_CODES:
                 return False
             else:
                 raise e
@@ -122,13 +158,29 @@ class S3:
         try:
             response = await self.client.head_object(Bucket=bucket_name, Key=key)
         except ClientError as e:
-            if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+            if e.response["Error"]["Code"] in _NOT_FOUND_ERROR_CODES:
                 return None
             else:
                 raise
         return response["ContentLength"]
 
 
+    async def get_objects_bytes_size_async(self, bucket_name: str, keys: Iterable[str], max_concurrent_requests: int = 64) -> dict[str, int | None]:
+        """
+        Return the bytes size of the objects at given keys (None for those that do not exist),
+        with at most 'max_concurrent_requests' requests at once
+        """
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+        async def get_size(key: str) -> int | None:
+            async with semaphore:
+                return await self.get_object_bytes_size_async(bucket_name, key)
+
+        keys = list(keys)
+        sizes = await asyncio.gather(*[get_size(key) for key in keys])
+        return dict(zip(keys, sizes))
+
+
     async def list_objects_key_and_size_paginated_async(
             self,
             bucket_name: str,
@@ -165,13 +217,20 @@ class S3:
         """
         Yield object keys and bytes size in a bucket at a prefix
         """
-        next_page_token = None
-        while True:
-            page, next_page_token = await self.list_objects_key_and_size_paginated_async(bucket_name, prefix)
-            for key, size in page:
-                yield key, size
-            if next_page_token is None:
-                return
+        if isinstance(prefix, pathlib.Path):
+            prefix = prefix.as_posix()
+        request = asyncio.create_task(self.client.list_objects_v2(Bucket=bucket_name, Prefix=prefix))
+        try:
+            while request is not None:
+                page = await request
+                # request the next page before processing the current one
+                next_token = page.get("NextContinuationToken")
+                request = None if next_token is None else asyncio.create_task(self.client.list_objects_v2(Bucket=bucket_name, Prefix=prefix, ContinuationToken=next_token))
+                for obj in page.get("Contents", []):
+                    yield obj["Key"], obj["Size"]
+        finally:
+            if request is not None:
+                request.cancel()
 
 
     async def upload_files_async(
@@ -180,27 +239,50 @@ class S3:
             bucket_name: str,
             prefix: str | pathlib.Path,
             overwrite: bool = False,
-            callback: Callable | None = None
+            callback: Callable | None = None,
+            max_concurrent_requests: int = 32,
         ):
         """
-        upload the files in the given file path (or a single file path) to the given s3 bucket at given prefix
+        upload the files in the given file path (or a single file path) to the given s3 bucket at given prefix.
+        Files are uploaded concurrently, with at most 'max_concurrent_requests' requests at once.
         """
         bucket = await self.resource.Bucket(bucket_name)
         files_path = pathlib.Path(files_path)
         prefix = pathlib.Path(prefix)
         if not files_path.exists():
             raise FileNotFoundError(f"The file_path '{files_path}' does not exist")
-        iterable = os.walk(files_path) if files_path.is_dir() else [(files_path.parent, [], [file_path.name])]
-        for root, dirs, files in iterable:
-            root = pathlib.Path(root)
-            for file in files:
-                file_path = (root / file).as_posix()
-                object_key = (prefix / root.relative_to(files_path) / file).as_posix()
-                if not overwrite and await self.object_exists_async(bucket_name, object_key):
+        key_prefix = "" if prefix == pathlib.Path("") else prefix.as_posix() + "/"
+        if files_path.is_dir():
+            base_path = os.path.join(files_path, "")  # with trailing separator
+            uploads = [(file_path, key_prefix + file_path[len(base_path):].replace(os.sep, "/")) for file_path in _iter_files(base_path)]
+        else:
+            uploads = [(os.fspath(files_path), key_prefix + files_path.name)]
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+        async def check_not_exists(object_key: str):
+            async with semaphore:
+                exists = await self.object_exists_async(bucket_name, object_key)
+            if exists:
+                raise FileExistsError(f"An object with key '{object_key}' exist already, use overwrite=True to overwrite")
+
+        async def check_none_exists():
+            existing = {key async for key, _ in self.list_objects_key_and_size_async(bucket_name, key_prefix)}
+            for _, object_key in uploads:
+                if object_key in existing:
                     raise FileExistsError(f"An object with key '{object_key}' exist already, use overwrite=True to overwrite")
-                await bucket.upload_file(file_path, object_key)
-                if callback is not None:
-                    callback(file_path=file_path, object_key=object_key)
+
+        async def upload(file_path: str, object_key: str):
+            async with semaphore:
+                await bucket.upload_file(file_path, object_key, Config=_TRANSFER_CONFIG)
+            if callback is not None:
+                callback(file_path=file_path, object_key=object_key)
+
+        if not overwrite:
+            if len(uploads) > _HEAD_CHECK_MAX_FILES:
+                await check_none_exists()
+            else:
+                await asyncio.gather(*[check_not_exists(object_key) for _, object_key in uploads])
+        await asyncio.gather(*[upload(file_path, object_key) for file_path, object_key in uploads])
 
 
     async def download_files_async(
@@ -209,10 +291,12 @@ class S3:
             prefix: str | pathlib.Path,
             directory: str | pathlib.Path,
             create_missing_path: bool=False,
-            callback: Callable | None = None
+            callback: Callable | None = None,
+            max_concurrent_requests: int = 32,
         ):
         """
-        download the files at the given prefix (or a single file) of a given bucket in the given directory
+        download the files at the given prefix (or a single file) of a given bucket in the given directory.
+        Files are downloaded concurrently, with at most 'max_concurrent_requests' requests at once.
         """
         bucket = await self.resource.Bucket(bucket_name)
         directory = pathlib.Path(directory)
@@ -224,48 +308,113 @@ class S3:
         if not directory.is_dir():
             raise NotADirectoryError(f"The provided directory path '{directory}' is a file")
         prefix = pathlib.Path(prefix)
-        for key, size in self.list_objects_key_and_size_async(bucket_name, prefix):
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+        async def download(key: str):
             file_path = directory / pathlib.Path(key).relative_to(prefix)
             file_path.parent.mkdir(exist_ok=True, parents=True)
             file_path = file_path.as_posix()
-            await bucket.download_file(key, file_path)
+            async with semaphore:
+                await bucket.download_file(key, file_path, Config=_TRANSFER_CONFIG)
             if callback is not None:
                 callback(object_key=key, file_path=file_path)
 
+        tasks = []
+        try:
+            async for key, size in self.list_objects_key_and_size_async(bucket_name, prefix):
+                tasks.append(asyncio.create_task(download(key)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
 
     async def upload_data_async(
             self,
-            data: bytes,
+            data: bytes | bytearray | memoryview | BinaryIO,
             bucket_name: str,
             key: str|pathlib.Path,
             overwrite: bool = False
         ):
         """
-        save the given bytes as an object
+        save the given bytes as an object.
+        'data' can also be a binary file object, which is streamed from its current position without being loaded in memory
         """
         if isinstance(key, pathlib.Path):
             key = key.as_posix()
-        if not overwrite and await self.object_exists_async(bucket_name, key):
-            raise S3Exception(f"An object with key '{key}' exist already, use overwrite=True to overwrite")
-        obj = await self.resource.Object(bucket_name, key)
-        await obj.put(Key=key, Body=data)
+        if isinstance(data, memoryview):
+            # botocore only accepts bytes, bytearray or file objects: the underlying object is sent when the view covers all of it
+            if isinstance(data.obj, (bytes, bytearray)) and data.contiguous and data.nbytes == len(data.obj):
+                data = data.obj
+            else:
+                data = data.tobytes()
+        kwargs = {} if overwrite else {"IfNoneMatch": "*"}
+        try:
+            await self.client.put_object(Bucket=bucket_name, Key=key, Body=data, **kwargs)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("PreconditionFailed", "ConditionalRequestConflict"):
+                raise S3Exception(f"An object with key '{key}' exist already, use overwrite=True to overwrite")
+            else:
+                raise
 
 
-    async def download_data_async(self, bucket_name: str, key: str | pathlib.Path) -> bytes | None:
+    async def download_data_async(self, bucket_name: str, key: str | pathlib.Path, max_concurrent_requests: int = 16) -> bytes | None:
+        """
+        load the data stored in the given bucket file.
+        Objects larger than 8 MiB are downloaded by concurrent byte ranges,
+        with at most 'max_concurrent_requests' requests at once.
+        See 'download_data_to_bytearray_async' to avoid the final copy of large objects into a bytes object.
         """
-        load the data stored in the given bucket file
+        data = await self._download_data_async(bucket_name, key, max_concurrent_requests)
+        return bytes(data) if isinstance(data, bytearray) else data
+
+
+    async def download_data_to_bytearray_async(self, bucket_name: str, key: str | pathlib.Path, max_concurrent_requests: int = 16) -> bytearray | None:
+        """
+        Same as 'download_data_async', but returns a mutable bytearray.
+        Objects larger than 8 MiB are downloaded directly into the returned bytearray, without any final copy.
+        """
+        data = await self._download_data_async(bucket_name, key, max_concurrent_requests)
+        return bytearray(data) if isinstance(data, bytes) else data
+
+
+    async def _download_data_async(self, bucket_name: str, key: str | pathlib.Path, max_concurrent_requests: int) -> bytes | bytearray | None:
+        """
+        Returns the data of the object, as bytes if downloaded in a single request,
+        or as the bytearray the byte ranges were downloaded into
         """
         if isinstance(key, pathlib.Path):
             key = key.as_posix()
-        obj = await self.resource.Object(bucket_name, key)
         try:
-            response = await obj.get()
+            response = await self.client.get_object(Bucket=bucket_name, Key=key, Range=f"bytes=0-{_RANGED_GET_PART_SIZE - 1}")
         except ClientError as e:
-            if e.response["Error"]["Code"] == "NoSuchKey":
+            error_code = e.response["Error"]["Code"]
+            if error_code == "NoSuchKey":
                 return None
+            elif error_code == "InvalidRange":  # empty objects can't be requested by range
+                response = await self.client.get_object(Bucket=bucket_name, Key=key)
+                return await response["Body"].read()
             else:
                 raise
-        return await response["Body"].read()
+        first_part = await response["Body"].read()
+        size = int(response["ContentRange"].rpartition("/")[2])
+        if size <= len(first_part):
+            return first_part
+        data = bytearray(size)
+        data[:len(first_part)] = first_part
+        buffer = memoryview(data)
+        e_tag = response["ETag"]
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+        async def download_range(start: int):
+            end = min(start + _RANGED_GET_PART_SIZE, size)
+            async with semaphore:
+                response = await self.client.get_object(Bucket=bucket_name, Key=key, Range=f"bytes={start}-{end - 1}", IfMatch=e_tag)
+                buffer[start:end] = await response["Body"].read()
+
+        await asyncio.gather(*[download_range(start) for start in range(len(first_part), size, _RANGED_GET_PART_SIZE)])
+        buffer.release()
+        return data
     
     
     async def batch_download_data_async(self, bucket_name: str, keys: list[str | pathlib.Path], batch_size: int=5) -> list[bytes | None]:
@@ -297,19 +446,35 @@ class S3:
             yield chunk
 
 
-    async def delete_objects_async(self, bucket_name: str, prefix: str | pathlib.Path, callback: Callable | None = None):
+    async def delete_objects_async(self, bucket_name: str, prefix: str | pathlib.Path, callback: Callable | None = None, max_concurrent_requests: int = 8):
         """
-        Delete all objects that match the prefix
+        Delete all objects that match the prefix,
+        by batches of 1000 keys, with at most 'max_concurrent_requests' requests at once
         """
         bucket = await self.resource.Bucket(bucket_name)
-        objects = [obj async for obj, size in self.list_objects_key_and_size_async(bucket_name, prefix)]
-        delete = [{"Key": key} for i, key in zip(range(1_000), objects)]
-        if len(delete) == 0:
-            return
-        await bucket.delete_objects(Delete={"Objects": delete})
-        if callback is not None:
-            for obj in delete:
-                callback(object_key=obj["Key"])
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+        async def delete(batch: list[dict]):
+            async with semaphore:
+                await bucket.delete_objects(Delete={"Objects": batch})
+            if callback is not None:
+                for obj in batch:
+                    callback(object_key=obj["Key"])
+
+        tasks = []
+        batch = []
+        try:
+            async for key, size in self.list_objects_key_and_size_async(bucket_name, prefix):
+                batch.append({"Key": key})
+                if len(batch) == 1_000:
+                    tasks.append(asyncio.create_task(delete(batch)))
+                    batch = []
+            if len(batch) > 0:
+                tasks.append(asyncio.create_task(delete(batch)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
 
 
     async def copy_object_async(
@@ -317,17 +482,61 @@ class S3:
         source_bucket: str,
         source_key: str,
         dest_bucket: str,
-        dest_key: str
+        dest_key: str,
+        max_concurrent_requests: int = 10,
+        source_size: int | None = None,
     ):
         """
         Copy an object within S3.
+        Objects larger than 100 MiB are copied server side by concurrent byte ranges,
+        with at most 'max_concurrent_requests' requests at once,
+        keeping the content headers, metadata, tags and encryption settings of the source object.
+        The size of the source object is fetched with an additional 'head_object' request,
+        unless it is already known by the caller and given as 'source_size'.
         """
         copy_source = {"Bucket": source_bucket, "Key": source_key}
-        await self.client.copy_object(
+        if source_size is None or source_size >= _MULTIPART_COPY_THRESHOLD:
+            head = await self.client.head_object(Bucket=source_bucket, Key=source_key)
+            source_size = head["ContentLength"]
+        if source_size < _MULTIPART_COPY_THRESHOLD:
+            await self.client.copy_object(
+                Bucket=dest_bucket,
+                Key=dest_key,
+                CopySource=copy_source
+            )
+            return
+        part_size = max(_MULTIPART_COPY_PART_SIZE, -(-source_size // 10_000))  # at most 10 000 parts per upload
+        object_headers = {name: head[name] for name in _COPIED_OBJECT_HEADERS if name in head}
+        if head.get("TagCount", 0) > 0:
+            tagging = await self.client.get_object_tagging(Bucket=source_bucket, Key=source_key)
+            object_headers["Tagging"] = urlencode([(tag["Key"], tag["Value"]) for tag in tagging["TagSet"]])
+        response = await self.client.create_multipart_upload(
             Bucket=dest_bucket,
             Key=dest_key,
-            CopySource=copy_source
+            **object_headers,
         )
+        multipart_upload_id = response["UploadId"]
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+        async def copy_part(part_number: int, start: int) -> str:
+            async with semaphore:
+                response = await self.client.upload_part_copy(
+                    Bucket=dest_bucket,
+                    Key=dest_key,
+                    UploadId=multipart_upload_id,
+                    PartNumber=part_number,
+                    CopySource=copy_source,
+                    CopySourceIfMatch=head["ETag"],  # all parts come from the same version of the source object
+                    CopySourceRange=f"bytes={start}-{min(start + part_size, source_size) - 1}",
+                )
+            return response["CopyPartResult"]["ETag"]
+
+        try:
+            part_tags = await asyncio.gather(*[copy_part(i, start) for i, start in enumerate(range(0, source_size, part_size), start=1)])
+            await self.complete_multipart_upload_async(dest_bucket, dest_key, multipart_upload_id, part_tags)
+        except BaseException:
+            await self.abort_multipart_upload_async(dest_bucket, dest_key, multipart_upload_id)
+            raise
 
 
     async def delete_object_async(
@@ -347,12 +556,13 @@ class S3:
         source_bucket: str,
         source_key: str,
         dest_bucket: str,
-        dest_key: str
+        dest_key: str,
+        source_size: int | None = None,
     ):
         """
         Move an object in S3 by copying and then deleting.
         """
-        await self.copy_object_async(source_bucket, source_key, dest_bucket, dest_key)
+        await self.copy_object_async(source_bucket, source_key, dest_bucket, dest_key, source_size=source_size)
         await self.delete_object_async(source_bucket, source_key)
 
 
@@ -395,6 +605,40 @@ class S3:
         )
 
 
+    async def upload_data_multipart_async(
+            self,
+            data: bytes | bytearray | memoryview,
+            bucket_name: str,
+            key: str | pathlib.Path,
+            part_size: int = _MULTIPART_UPLOAD_PART_SIZE,
+            max_concurrent_requests: int = 10,
+            content_type: str = 'application/octet-stream',
+        ):
+        """
+        save the given bytes as an object, with a multipart upload of parts of 'part_size' bytes,
+        with at most 'max_concurrent_requests' parts uploaded at once.
+        The multipart upload is aborted if any part fails.
+        """
+        if part_size < 5 * 1024**2:
+            raise ValueError(f"Argument 'part_size' must not be lower than 5 MiB as per s3 limitation. got {part_size}.")
+        if isinstance(key, pathlib.Path):
+            key = key.as_posix()
+        buffer = memoryview(data).cast("B")
+        multipart_upload_id = await self.initiate_multipart_upload_async(bucket_name, key, content_type)
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+        async def upload_part(part_number: int, start: int) -> str:
+            async with semaphore:
+                return await self.upload_part_async(bucket_name, key, multipart_upload_id, part_number, buffer[start:start+part_size].tobytes())
+
+        try:
+            part_tags = await asyncio.gather(*[upload_part(i, start) for i, start in enumerate(range(0, max(len(buffer), 1), part_size), start=1)])
+            await self.complete_multipart_upload_async(bucket_name, key, multipart_upload_id, part_tags)
+        except BaseException:
+            await self.abort_multipart_upload_async(bucket_name, key, multipart_upload_id)
+            raise
+
+
     async def generate_download_url_async(self, bucket_name: str, key: str, expiration: int = 3600) -> str:
         """
         Generate a download url, for the given s3 object, with the given validity
@@ -407,11 +651,11 @@ class S3:
 
 
     @staticmethod
-    def s3_uri_to_bucket_and_key(self, s3_uri: str) -> tuple[str, str]:
+    def s3_uri_to_bucket_and_key(s3_uri: str) -> tuple[str, str]:
         """
         Splits an "s3://bucket-name/s3/path" uri into a ("bucket-name", "s3/path") tuple of str
         """
-        parsed = urlparse(s3_uri)
-        scheme, s3_bucket, s3_object_key = parsed.scheme, parsed.netloc, parsed.path
-        assert scheme == "s3"
-        return s3_bucket, s3_object_key.lstrip("/")
+        if not s3_uri.startswith("s3://"):
+            raise ValueError(f"Expected an uri starting with 's3://', got '{s3_uri}'")
+        s3_bucket, _, s3_object_key = s3_uri[5:].partition("/")
+        return s3_bucket, s3_object_key
@@ -5,9 +5,10 @@ https://docs.aws.amazon.com/ses/latest/dg/event-publishing-retrieving-sns-conten
 You can find some examples here:
 https://docs.aws.amazon.com/ses/latest/dg/event-publishing-retrieving-sns-examples.html
 """
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Literal, Union
-from aiobotocore.session import get_session, AioBaseClient
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
+from typing import Literal, Union, Annotated
+from aiobotocore.session import AioBaseClient
+from aws_tools._session import _get_shared_session, _CLIENT_CONFIG
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
@@ -28,11 +29,11 @@ class SimpleEmailingService:
     """
 
     def __init__(self):
-        self.session = get_session()
+        self.session = _get_shared_session()
         self._client: AioBaseClient | None = None
 
     async def open(self):
-        self._client = await self.session.create_client("ses").__aenter__()
+        self._client = await self.session.create_client("ses", config=_CLIENT_CONFIG).__aenter__()
 
     async def close(self):
         await self._client.__aexit__(None, None, None)
@@ -126,23 +127,30 @@ class SimpleEmailingService:
         return response
 
 
-class _SESEvent(BaseModel):
+class _SESModel(BaseModel):
+    """
+    base class for SES payload objects, which are read-only
+    """
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+
+class _SESEvent(_SESModel):
     """
     base class for SES related events
     """
     model_config = ConfigDict(populate_by_name=True)
 
 
-class Mail(BaseModel):
+class Mail(_SESModel):
     """
     https://docs.aws.amazon.com/ses/latest/dg/event-publishing-retrieving-sns-contents.html#event-publishing-retrieving-sns-contents-mail-object
     """
 
-    class Header(BaseModel):
+    class Header(_SESModel):
         name: str
         value: str
 
-    class CommonHeaders(BaseModel):
+    class CommonHeaders(_SESModel):
         from_: list[str] = Field(alias="from")
         to: list[str]
         messageId: str
@@ -159,7 +167,7 @@ class Mail(BaseModel):
     commonHeaders: CommonHeaders | None = None
 
 
-class Recipient(BaseModel):
+class Recipient(_SESModel):
     """
     https://docs.aws.amazon.com/ses/latest/dg/event-publishing-retrieving-sns-contents.html#event-publishing-retrieving-sns-contents-complained-recipients
     """
@@ -262,7 +270,7 @@ class DeliveryDelayEvent(_SESEvent):
     https://docs.aws.amazon.com/ses/latest/dg/event-publishing-retrieving-sns-contents.html#event-publishing-retrieving-sns-contents-delivery-delay-object
     """
 
-    class DelayedRecipients(BaseModel):
+    class DelayedRecipients(_SESModel):
         """
         https://docs.aws.amazon.com/ses/latest/dg/event-publishing-retrieving-sns-contents.html#event-publishing-retrieving-sns-contents-delivery-delay-object-recipients
         """
@@ -281,11 +289,11 @@ class SubscriptionEvent(_SESEvent):
     https://docs.aws.amazon.com/ses/latest/dg/event-publishing-retrieving-sns-contents.html#event-publishing-retrieving-sns-contents-subscription-object
     """
 
-    class TopicPreferences(BaseModel):
+    class TopicPreferences(_SESModel):
         """
         """
 
-        class TopicSubscriptionStatus(BaseModel):
+        class TopicSubscriptionStatus(_SESModel):
             """
             """
             topicName: str
@@ -318,3 +326,96 @@ class SESEmailEvent(_SESEvent):
     failure: RenderingFailureEvent | None = None
     deliveryDelay: DeliveryDelayEvent | None = None
     subscription: SubscriptionEvent | None = None
+
+
+class SESBounceEmailEvent(SESEmailEvent):
+    """
+    SESEmailEvent of type 'Bounce'
+    """
+    eventType: Literal["Bounce"]
+    bounce: BounceEvent
+
+
+class SESComplaintEmailEvent(SESEmailEvent):
+    """
+    SESEmailEvent of type 'Complaint'
+    """
+    eventType: Literal["Complaint"]
+    complaint: ComplaintEvent
+
+
+class SESDeliveryEmailEvent(SESEmailEvent):
+    """
+    SESEmailEvent of type 'Delivery'
+    """
+    eventType: Literal["Delivery"]
+    delivery: DeliveryEvent
+
+
+class SESSendEmailEvent(SESEmailEvent):
+    """
+    SESEmailEvent of type 'Send'
+    """
+    eventType: Literal["Send"]
+    send: SendEvent
+
+
+class SESRejectEmailEvent(SESEmailEvent):
+    """
+    SESEmailEvent of type 'Reject'
+    """
+    eventType: Literal["Reject"]
+    reject: RejectEvent
+
+
+class SESOpenEmailEvent(SESEmailEvent):
+    """
+    SESEmailEvent of type 'Open'
+    """
+    eventType: Literal["Open"]
+    open: OpenEvent
+
+
+class SESClickEmailEvent(SESEmailEvent):
+    """
+    SESEmailEvent of type 'Click'
+    """
+    eventType: Literal["Click"]
+    click: ClickEvent
+
+
+class SESRenderingFailureEmailEvent(SESEmailEvent):
+    """
+    SESEmailEvent of type 'Rendering Failure'
+    """
+    eventType: Literal["Rendering Failure"]
+    failure: RenderingFailureEvent
+
+
+class SESDeliveryDelayEmailEvent(SESEmailEvent):
+    """
+    SESEmailEvent of type 'DeliveryDelay'
+    """
+    eventType: Literal["DeliveryDelay"]
+    deliveryDelay: DeliveryDelayEvent
+
+
+class SESSubscriptionEmailEvent(SESEmailEvent):
+    """
+    SESEmailEvent of type 'Subscription'
+    """
+    eventType: Literal["Subscription"]
+    subscription: SubscriptionEvent
+
+
+SESEmailEventTypes = Annotated[Union[SESBounceEmailEvent, SESComplaintEmailEvent, SESDeliveryEmailEvent, SESSendEmailEvent, SESRejectEmailEvent, SESOpenEmailEvent, SESClickEmailEvent, SESRenderingFailureEmailEvent, SESDeliveryDelayEmailEvent, SESSubscriptionEmailEvent], Field(discriminator="eventType")]
+_SES_EMAIL_EVENT_ADAPTER = TypeAdapter(SESEmailEventTypes)
+
+
+def SESEvent(payload: str | bytes) -> SESEmailEventTypes:
+    """
+    Load an SESEmailEvent object from its json representation
+    (such as the 'Message' field of an SNS notification),
+    as the subclass matching its 'eventType', in which the corresponding event field is not optional
+    """
+    return _SES_EMAIL_EVENT_ADAPTER.validate_json(payload)
@@ -2,16 +2,21 @@
 Here below the documentation of the expected payload format for the API route handling SNS topic subscription :
 https://docs.aws.amazon.com/sns/latest/dg/sns-message-and-json-formats.html
 """
+import re
+import ssl
+import time
 import base64
+import asyncio
 import aiohttp
-from aiobotocore.session import get_session, AioBaseClient
+from aiobotocore.session import AioBaseClient
+from aws_tools._session import _get_shared_session, _CLIENT_CONFIG
 from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
 from cryptography.hazmat.primitives import hashes
-from cryptography.x509 import load_pem_x509_certificate, Certificate
+from cryptography.x509 import load_pem_x509_certificate
 from cryptography.hazmat.backends import default_backend
 from cryptography.exceptions import InvalidSignature
-from urllib.parse import urlparse
-from pydantic import BaseModel, TypeAdapter
+from pydantic import BaseModel, TypeAdapter, Field
 from typing import Literal, Annotated, Union
 
 
@@ -23,6 +28,48 @@ HEADERS = [
     "x-amz-sns-subscription-arn"  # 'arn:aws:sns:us-west-2:123456789012:MyTopic:2bcfbf39-05c3-41de-beaa-fcfcc21c8f55'
 ]
 
+_NOTIFICATION_SIGNED_FIELDS = ("Message", "MessageId", "Subject", "Timestamp", "TopicArn", "Type")
+_SUBSCRIPTION_SIGNED_FIELDS = ("Message", "MessageId", "SubscribeURL", "Timestamp", "Token", "TopicArn", "Type")
+_SIGNED_FIELDS = {  # fields of the signed string, in order, by message type
+    "Notification": _NOTIFICATION_SIGNED_FIELDS,
+    "SubscriptionConfirmation": _SUBSCRIPTION_SIGNED_FIELDS,
+    "UnsubscribeConfirmation": _SUBSCRIPTION_SIGNED_FIELDS,
+}
+_SIGNING_CERT_URL = re.compile(r"https://sns\.[a-z0-9-]+\.amazonaws\.com(\.cn)?/")
+_SIGNATURE_HASHES = {"1": hashes.SHA1(), "2": hashes.SHA256()}  # by SignatureVersion
+_SIGNATURE_PADDING = padding.PKCS1v15()
+_SIGNING_KEY_TTL = 3600.0  # duration in seconds for which the public keys of downloaded signing certificates are cached
+_signing_keys: dict[str, tuple[float, RSAPublicKey]] = {}  # {cert_url: (expiration_time, public_key)}
+_signing_key_requests: dict[str, asyncio.Future] = {}  # {cert_url: pending download}
+_SSL_CONTEXT = ssl.create_default_context()  # loads the system trust store once, at import
+_http_sessions: dict[asyncio.AbstractEventLoop, tuple[aiohttp.ClientSession, asyncio.Task]] = {}  # {loop: (session, task closing it at loop shutdown)}
+
+
+async def _close_http_session_at_shutdown(loop: asyncio.AbstractEventLoop, session: aiohttp.ClientSession):
+    """
+    Wait until cancelled, which 'asyncio.run' does to the remaining tasks when it shuts down its loop, then close the session
+    """
+    try:
+        await loop.create_future()
+    finally:
+        if _http_sessions.get(loop, (None,))[0] is session:
+            del _http_sessions[loop]
+        await session.close()
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    """
+    Returns the http session used to download signing certificates,
+    shared by all calls made from the running event loop so that connections are reused,
+    and closed when this loop shuts down
+    """
+    loop = asyncio.get_running_loop()
+    session, _ = _http_sessions.get(loop, (None, None))
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, ssl=_SSL_CONTEXT))
+        _http_sessions[loop] = (session, loop.create_task(_close_http_session_at_shutdown(loop, session)))
+    return session
+
 
 class _SNSEvent(BaseModel):
     """
@@ -64,15 +111,15 @@ class SNSUnsubscribeRequest(_SNSEvent):
     SubscribeURL: Annotated[str, "https://sns.us-west-2.amazonaws.com/?Action=ConfirmSubscription&TopicArn=arn:aws:sns:us-west-2:123456789012:MyTopic&Token=2336412f37fb6..."]
 
 
-SNSEventsTypes = Union[SNSSubscriptionConfirmationRequest, SNSNotificationRequest, SNSUnsubscribeRequest]
-assert set(_SNSEvent.__subclasses__()) == set(SNSEventsTypes.__args__)
+SNSEventsTypes = Annotated[Union[SNSSubscriptionConfirmationRequest, SNSNotificationRequest, SNSUnsubscribeRequest], Field(discriminator="Type")]
+_SNS_EVENT_ADAPTER = TypeAdapter(SNSEventsTypes)
 
 
 def SNSEvent(payload: dict) -> SNSEventsTypes:
     """
     Load an SNSEvent object, with type matching
     """
-    return TypeAdapter(SNSEventsTypes).validate_python(payload)
+    return _SNS_EVENT_ADAPTER.validate_python(payload)
 
 
 class SimpleNotificationService:
@@ -90,11 +137,11 @@ class SimpleNotificationService:
     """
 
     def __init__(self):
-        self.session = get_session()
+        self.session = _get_shared_session()
         self._client: AioBaseClient | None = None
 
     async def open(self):
-        self._client = await self.session.create_client("sns").__aenter__()
+        self._client = await self.session.create_client("sns", config=_CLIENT_CONFIG).__aenter__()
 
     async def close(self):
         await self._client.__aexit__(None, None, None)
@@ -126,64 +173,97 @@ class SimpleNotificationService:
     @staticmethod
     def _is_valid_cert_url(cert_url: str) -> bool:
         """
-        Verify that the SigningCertURL is a valid AWS URL
+        Verify that the SigningCertURL is an https URL of an SNS endpoint
         """
-        parsed = urlparse(cert_url)
-        return (parsed.scheme == "https" and
-                parsed.hostname and
-                parsed.hostname.endswith(".amazonaws.com"))
+        return _SIGNING_CERT_URL.match(cert_url) is not None
 
     @staticmethod
-    def _get_signed_string(message: SNSEventsTypes) -> str:
+    def _get_signed_bytes(message: SNSEventsTypes) -> bytes:
         """
-        Construct the string that was originally signed
+        Construct the utf-8 encoded string that was originally signed
         https://docs.aws.amazon.com/sns/latest/dg/sns-verify-signature-of-message-verify-message-signature.html
         """
-        if message.Type == "Notification":
-            fields_to_sign = ("Message", "MessageId", "Subject", "Timestamp", "TopicArn", "Type")
-        elif message.Type in ("SubscriptionConfirmation", "UnsubscribeConfirmation"):
-            fields_to_sign = ("Message", "MessageId", "SubscribeURL", "Timestamp", "Token", "TopicArn", "Type")
-        else:
+        fields_to_sign = _SIGNED_FIELDS.get(message.Type)
+        if fields_to_sign is None:
             raise RuntimeError(f"Unexpected message type '{message.Type}'")
-        field_values = [(field, getattr(message, field, None)) for field in fields_to_sign]
-        string_to_sign = "".join(f"{field}\n{value}\n" for field, value in field_values if value is not None)
-        return string_to_sign
+        values = message.__dict__
+        return "".join([f"{field}\n{values[field]}\n" for field in fields_to_sign if values.get(field) is not None]).encode("utf-8")
 
     @staticmethod
-    async def _get_signing_certificate_async(cert_url: str) -> Certificate:
+    async def _download_signing_public_key_async(cert_url: str) -> RSAPublicKey:
         """
-        Download the certificate from the SigningCertURL
+        Download the certificate from the SigningCertURL, and cache its public key
         """
-        async with aiohttp.ClientSession() as session:
-            async with session.get(cert_url) as response:
-                cert_data = await response.read()
-        return load_pem_x509_certificate(cert_data, default_backend())
+        async with _get_http_session().get(cert_url) as response:
+            cert_data = await response.read()
+        public_key = load_pem_x509_certificate(cert_data, default_backend()).public_key()
+        _signing_keys[cert_url] = (time.monotonic() + _SIGNING_KEY_TTL, public_key)
+        return public_key
 
     @staticmethod
-    async def verify_sns_signature_async(body: SNSEventsTypes) -> bool:
+    async def _get_signing_public_key_async(cert_url: str) -> RSAPublicKey:
         """
-        Verify the signature of an SNS message
-        https://docs.aws.amazon.com/sns/latest/dg/sns-verify-signature-of-message.html
+        Returns the public key of the certificate from the SigningCertURL, downloading it only if it is not cached already.
+        Concurrent calls for the same url share a single download.
+        """
+        cached = _signing_keys.get(cert_url)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        request = _signing_key_requests.get(cert_url)
+        if request is None or request.get_loop() is not asyncio.get_running_loop():
+            request = asyncio.ensure_future(SimpleNotificationService._download_signing_public_key_async(cert_url))
+            _signing_key_requests[cert_url] = request
+
+            def forget(done: asyncio.Future):
+                if _signing_key_requests.get(cert_url) is done:
+                    del _signing_key_requests[cert_url]
+
+            request.add_done_callback(forget)
+        return await asyncio.shield(request)
+
+    @staticmethod
+    def _verify_signature(body: SNSEventsTypes, public_key: RSAPublicKey) -> bool:
+        """
+        Verify the signature of an SNS message against the public key of its signing certificate
         """
-        if not SimpleNotificationService._is_valid_cert_url(body.SigningCertURL):
-            return False
         decoded_signature = base64.b64decode(body.Signature)
-        cert = await SimpleNotificationService._get_signing_certificate_async(body.SigningCertURL)
-        public_key = cert.public_key()
-        if body.SignatureVersion == "1":
-            hash = hashes.SHA1()
-        elif body.SignatureVersion == "2":
-            hash = hashes.SHA256()
-        else:
+        hash = _SIGNATURE_HASHES.get(body.SignatureVersion)
+        if hash is None:
             raise RuntimeError(f"Unexpected signature version '{body.SignatureVersion}'")
         try:
             public_key.verify(
                 decoded_signature,
-                SimpleNotificationService._get_signed_string(body).encode("utf-8"),
-                padding.PKCS1v15(),
+                SimpleNotificationService._get_signed_bytes(body),
+                _SIGNATURE_PADDING,
                 hash
             )
         except InvalidSignature:
             return False
         else:
             return True
+
+    @staticmethod
+    async def verify_sns_signature_async(body: SNSEventsTypes) -> bool:
+        """
+        Verify the signature of an SNS message
+        https://docs.aws.amazon.com/sns/latest/dg/sns-verify-signature-of-message.html
+        """
+        if not SimpleNotificationService._is_valid_cert_url(body.SigningCertURL):
+            return False
+        public_key = await SimpleNotificationService._get_signing_public_key_async(body.SigningCertURL)
+        return SimpleNotificationService._verify_signature(body, public_key)
+
+    @staticmethod
+    async def verify_sns_signatures_async(bodies: list[SNSEventsTypes]) -> list[bool]:
+        """
+        Verify the signature of several SNS messages.
+        The signing certificate of each distinct SigningCertURL is fetched once, concurrently.
+        Messages whose signing certificate could not be fetched are reported as not verified.
+        """
+        cert_urls = list({body.SigningCertURL for body in bodies if SimpleNotificationService._is_valid_cert_url(body.SigningCertURL)})
+        results = await asyncio.gather(*[SimpleNotificationService._get_signing_public_key_async(url) for url in cert_urls], return_exceptions=True)
+        public_keys = {url: key for url, key in zip(cert_urls, results) if not isinstance(key, BaseException)}
+        return [
+            body.SigningCertURL in public_keys and SimpleNotificationService._verify_signature(body, public_keys[body.SigningCertURL])
+            for body in bodies
+        ]
@@ -1,6 +1,9 @@
+import asyncio
 from typing import Literal, Iterable
+from itertools import islice
 from pydantic import BaseModel, Field
-from aiobotocore.session import get_session, AioBaseClient
+from aiobotocore.session import AioBaseClient
+from aws_tools._session import _get_shared_session, _CLIENT_CONFIG
 
 
 class SQSMessageAttribute(BaseModel):
@@ -10,6 +13,21 @@ class SQSMessageAttribute(BaseModel):
     string_list_values: list[str] = Field([], alias="StringListValues")
     binary_list_values: list[bytes] = Field([], alias="BinaryListValues")
 
+    def to_entry(self) -> dict:
+        """
+        Returns the attribute in the format expected by the SQS API, with only the values that are set
+        """
+        entry = {"DataType": self.data_type}
+        if self.string_value:
+            entry["StringValue"] = self.string_value
+        if self.binary_value:
+            entry["BinaryValue"] = self.binary_value
+        if self.string_list_values:
+            entry["StringListValues"] = self.string_list_values
+        if self.binary_list_values:
+            entry["BinaryListValues"] = self.binary_list_values
+        return entry
+
 
 class SQSMessage(BaseModel):
     body: str = Field(..., alias="Body")
@@ -23,6 +41,20 @@ class SQSMessageResponse(SQSMessage):
     attributes: dict[str, str] = Field({}, alias="Attributes")
     md5_of_attributes: str | None = Field(None, alias="MD5OfMessageAttributes")
 
+    @classmethod
+    def from_response(cls, message: dict) -> "SQSMessageResponse":
+        """
+        Build the object from a message returned by the SQS API, skipping validation as botocore already parsed it.
+        Falls back to validation if a required field is missing.
+        """
+        if not _RESPONSE_REQUIRED_KEYS <= message.keys():
+            return cls(**message)
+        attributes = {k: SQSMessageAttribute.model_construct(**v) for k, v in message.get("MessageAttributes", {}).items()}
+        return cls.model_construct(**{**message, "MessageAttributes": attributes})
+
+
+_RESPONSE_REQUIRED_KEYS = frozenset(field.alias for field in SQSMessageResponse.model_fields.values() if field.is_required())
+
 
 class SimpleQueueService:
     """
@@ -37,11 +69,11 @@ class SimpleQueueService:
     """
 
     def __init__(self):
-        self.session = get_session()
+        self.session = _get_shared_session()
         self._client: AioBaseClient | None = None
 
     async def open(self):
-        self._client = await self.session.create_client("sqs").__aenter__()
+        self._client = await self.session.create_client("sqs", config=_CLIENT_CONFIG).__aenter__()
 
     async def close(self):
         await self._client.__aexit__(None, None, None)
@@ -57,7 +89,7 @@ class SimpleQueueService:
     @property
     def client(self) -> object:
         if self._client is None:
-            self._raise_not_initialized()
+            raise RuntimeError(f"{type(self).__name__} object is not initialized")
         else:
             return self._client
 
@@ -70,7 +102,7 @@ class SimpleQueueService:
             MaxNumberOfMessages=max_messages,
             WaitTimeSeconds=wait_seconds,
         )
-        return [SQSMessageResponse(**msg) for msg in response.get("Messages", [])]
+        return [SQSMessageResponse.from_response(msg) for msg in response.get("Messages", [])]
 
 
     async def delete_sqs_event_async(self, queue_url: str, receipt_handle: str):
@@ -88,41 +120,69 @@ class SimpleQueueService:
         """
         response = await self.client.send_message(
             QueueUrl=queue_url,
-            MessageBody=message.Body,
-            MessageAttributes={k: v.model_dump(by_alias=True) for k, v in message.MessageAttributes.items()},
+            MessageBody=message.body,
+            MessageAttributes={k: v.to_entry() for k, v in message.message_attributes.items()},
             DelaySeconds=delay_seconds,
         )
         return SQSMessageResponse(**response)
 
 
-    async def batch_send_sqs_messages_async(self, queue_url: str, messages: Iterable[SQSMessage], delay_seconds: int=0, chunk_size: int=10):
+    async def batch_send_sqs_messages_async(self, queue_url: str, messages: Iterable[SQSMessage], delay_seconds: int=0, chunk_size: int=10, max_concurrent_requests: int=10):
         """
-        Send the given messages to the SQS queue, by batches of chunk_size, with retry for failures
+        Send the given messages to the SQS queue, by batches of chunk_size, with retry for failures.
+        Batches are sent concurrently, with at most 'max_concurrent_requests' requests at once.
         """
-        iterable = iter(messages)
-        message_to_process = True
-        batch: dict[str, SQSMessage] = {}
-        while message_to_process or len(batch) > 0:
-            while len(batch) < chunk_size:
-                try:
-                    batch[f"msg{len(batch)}"] = next(iterable)
-                except StopIteration:
-                    message_to_process = False
+        entries = (
+            {
+                "MessageBody": message.body,
+                "MessageAttributes": {k: v.to_entry() for k, v in message.message_attributes.items()},
+                "DelaySeconds": delay_seconds,
+            }
+            for message in messages
+        )
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+        pending: set[asyncio.Task] = set()
+        errors: list[BaseException] = []
+
+        async def send(batch: list[dict]):
+            """
+            send a batch of entries (serialized once even if they are retried, with id 'msg{index}'), until none failed
+            """
+            while len(batch) > 0:
+                response = await self.client.send_message_batch(
+                    QueueUrl=queue_url,
+                    Entries=[{"Id": f"msg{i}", **entry} for i, entry in enumerate(batch)]
+                )
+                retry = []
+                for failed in response.get("Failed", []):
+                    if failed["SenderFault"]:
+                        raise RuntimeError(f"Failed to send a message to SQS queue: '{failed['Message']}'")
+                    retry.append(batch[int(failed["Id"].removeprefix("msg"))])
+                batch = retry
+
+        def on_done(task: asyncio.Task):
+            """
+            release the slot of a finished batch, even if it was cancelled before it started, and keep its error
+            """
+            semaphore.release()
+            pending.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                errors.append(task.exception())
+
+        try:
+            while True:
+                await semaphore.acquire()
+                if len(errors) > 0:  # stop consuming messages as soon as a batch failed
+                    raise errors[0]
+                batch = list(islice(entries, chunk_size))
+                if len(batch) == 0:
                     break
-            response = await self.client.send_message_batch(
-                QueueUrl=queue_url,
-                Entries=[
-                    {
-                        "Id": k,
-                        "MessageBody": m.Body,
-                        "MessageAttributes": {k: v.model_dump(by_alias=True) for k, v in m.MessageAttributes.items()},
-                        "DelaySeconds": delay_seconds,
-                    }
-                    for k, m in batch.items()
-                ]
-            )
-            for failed in response["Failed"]:
-                if failed["SenderFault"]:
-                    raise RuntimeError(f"Failed to send a message to SQS queue: '{failed['Message']}'")
-            retry = (failed for failed in response["Failed"] if not failed["SenderFault"])
-            batch = {f"msg{i}": batch[failed["Id"]] for i, failed in enumerate(retry)}
+                task = asyncio.create_task(send(batch))
+                pending.add(task)
+                task.add_done_callback(on_done)
+            await asyncio.gather(*pending)
+            if len(errors) > 0:
+                raise errors[0]
+        finally:
+            for task in list(pending):
+                task.cancel()
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
-from aiobotocore.session import get_session, AioBaseClient
+from aiobotocore.session import AioBaseClient
+from aws_tools._session import _get_shared_session, _CLIENT_CONFIG
 
 
 class CallerIdentity(BaseModel):
@@ -21,11 +22,11 @@ class SecurityTokenService:
     """
 
     def __init__(self):
-        self.session = get_session()
+        self.session = _get_shared_session()
         self._client: AioBaseClient | None = None
 
     async def open(self):
-        self._client = await self.session.create_client("sts").__aenter__()
+        self._client = await self.session.create_client("sts", config=_CLIENT_CONFIG).__aenter__()
 
     async def close(self):
         await self._client.__aexit__(None, None, None)
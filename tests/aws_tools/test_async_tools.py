@@ -0,0 +1,94 @@
+import gc
+import sys
+import asyncio
+import pathlib
+import tempfile
+import unittest
+import warnings
+import importlib.util
+from typing import AsyncIterable
+from aws_tools._async_tools import _run_async, _async_iter_to_sync, _sync_iter_to_async, _generate_sync_module
+from aws_tools._check_fail_context import check_fail
+
+
+SAMPLE_MODULE = '''
+from typing import AsyncIterable
+
+
+async def add_async(a: int, b: int = 1) -> int:
+    """
+    Add two numbers
+    """
+    return a + b
+
+
+async def count_async(n: int, fail: bool = False, default: str = ")") -> AsyncIterable[int]:
+    for i in range(n):
+        yield i
+    if fail:
+        raise ValueError(default)
+
+
+async def _private_async():
+    pass
+'''
+
+
+async def _count(n: int, fail: bool = False) -> AsyncIterable[int]:
+    for i in range(n):
+        yield i
+    if fail:
+        raise ValueError("failed")
+
+
+class TestAsyncTools(unittest.TestCase):
+
+    def test_run_async(self):
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+        assert _run_async(add(1, 2)) == 3
+        async def nested():
+            return _run_async(add(1, 2))
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            with check_fail(RuntimeError):
+                asyncio.run(nested())
+            gc.collect()
+        assert not any("never awaited" in str(w.message) for w in caught)
+
+    def test_async_iter_to_sync(self):
+        assert list(_async_iter_to_sync(_count(1000))) == list(range(1000))
+        with check_fail(ValueError):
+            list(_async_iter_to_sync(_count(10, fail=True)))
+        iterator = _async_iter_to_sync(_count(1000))
+        assert next(iterator) == 0
+        iterator.close()
+
+    def test_sync_iter_to_async(self):
+        async def test():
+            return [i async for i in _sync_iter_to_async(range(100), yield_every=7)]
+        assert asyncio.run(test()) == list(range(100))
+
+    def test_generate_sync_module(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory) / "sample_module.py"
+            path.write_text(SAMPLE_MODULE)
+            spec = importlib.util.spec_from_file_location("sample_module", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            code = _generate_sync_module(module)
+        sys.modules["sample_module"] = module
+        assert "def add(a: int, b: int=1) -> int:" in code
+        assert "def count(n: int, fail: bool=False, default: str=')') -> Iterable[int]:" in code
+        assert "_private" not in code
+        generated = {"__name__": "sample_module_sync"}
+        exec(compile(code, "sample_module_sync", "exec"), generated)
+        assert generated["add"](1, b=2) == 3
+        assert list(generated["count"](3)) == [0, 1, 2]
+        with check_fail(ValueError):
+            list(generated["count"](3, fail=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
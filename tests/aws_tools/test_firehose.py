@@ -0,0 +1,63 @@
+import json
+import asyncio
+import unittest
+from aws_tools.firehose import Firehose
+from aws_tools._check_fail_context import check_fail
+
+
+class _RecordingClient:
+    """
+    Stands in for the firehose client, keeping the records put
+    """
+
+    def __init__(self):
+        self.records: list[bytes] = []
+
+    async def put_record(self, DeliveryStreamName: str, Record: dict):
+        self.records.append(Record["Data"])
+
+    async def put_record_batch(self, DeliveryStreamName: str, Records: list[dict]) -> dict:
+        assert 0 < len(Records) <= 500
+        self.records.extend(record["Data"] for record in Records)
+        return {"FailedPutCount": 0, "RequestResponses": [{"RecordId": str(i)} for i in range(len(Records))]}
+
+
+class TestFirehose(unittest.TestCase):
+
+    def test_firehose_writer(self):
+        cases = [
+            ({"service": "api", "version": 3}, {"event": "login", "user": "bob"}),
+            ({}, {"event": "login"}),
+            ({"service": "api"}, {}),
+            ({}, {}),
+        ]
+        for static, fields in cases:
+            firehose = Firehose()
+            firehose._client = _RecordingClient()
+            write_async = firehose.make_firehose_writer("stream", static)
+            asyncio.run(write_async(fields))
+            assert firehose._client.records == [json.dumps({**static, **fields}, separators=(",", ":")).encode() + b"\n"]
+
+    def test_firehose_writer_overlapping_keys(self):
+        firehose = Firehose()
+        firehose._client = _RecordingClient()
+        write_async = firehose.make_firehose_writer("stream", {"service": "api"})
+        with check_fail(ValueError):
+            asyncio.run(write_async({"service": "worker"}))
+        assert firehose._client.records == []
+
+    def test_batch_save_to_firehose(self):
+        firehose = Firehose()
+        firehose._client = _RecordingClient()
+        records = [{"index": i} for i in range(1234)]
+        asyncio.run(firehose.batch_save_to_firehose_async(records, "stream", chunk_size=100))
+        assert firehose._client.records == [json.dumps(r, separators=(",", ":")).encode() + b"\n" for r in records]
+        for chunk_size in (0, -1, 501):
+            with check_fail(ValueError):
+                asyncio.run(firehose.batch_save_to_firehose_async(records, "stream", chunk_size=chunk_size))
+        with check_fail(ValueError):
+            asyncio.run(firehose.batch_save_to_firehose_async(["x" * 1024**2], "stream"))
+
+
+if __name__ == "__main__":
+    unittest.main()
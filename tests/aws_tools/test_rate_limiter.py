@@ -0,0 +1,26 @@
+import time
+import asyncio
+import unittest
+from aws_tools._rate_limiter import _AsyncTokenBucket
+from aws_tools._check_fail_context import check_fail
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_arguments(self):
+        for rate, capacity in [(0, 1), (-1, 1), (1, 0), (1, -1)]:
+            with check_fail(ValueError):
+                _AsyncTokenBucket(rate=rate, capacity=capacity)
+
+    def test_acquire(self):
+        async def acquire_all(bucket: _AsyncTokenBucket, n: int) -> float:
+            start = time.monotonic()
+            for _ in range(n):
+                await bucket.acquire()
+            return time.monotonic() - start
+        assert asyncio.run(acquire_all(_AsyncTokenBucket(rate=100, capacity=5), 5)) < 0.01
+        assert asyncio.run(acquire_all(_AsyncTokenBucket(rate=100, capacity=5), 10)) >= 0.04
+
+
+if __name__ == "__main__":
+    unittest.main()
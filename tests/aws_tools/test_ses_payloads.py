@@ -1,7 +1,7 @@
 import json
 import pathlib
 import unittest
-from aws_tools.ses import SESEmailEvent
+from aws_tools.ses import SESEmailEvent, SESEmailEventTypes, SESEvent
 
 
 
@@ -13,14 +13,20 @@ SESEmailEvent.model_config = {"extra": "forbid"}
 
 class TestSES(unittest.TestCase):
 
+    def test_event_types(self):
+        assert set(SESEmailEvent.__subclasses__()) == set(SESEmailEventTypes.__origin__.__args__)
+
     def test_list_files_in_data_path(self):
         files = list(data_path.glob("*"))
         files = [f for f in data_path.iterdir() if f.is_file() and f.suffix.lower() == ".json"]
         for file in files:
             with open(data_path / file, "r") as h:
-                kwargs = json.load(h)
+                payload = h.read()
+            kwargs = json.loads(payload)
             print(file.stem)
-            SESEmailEvent(**kwargs)
+            event = SESEvent(payload)
+            assert isinstance(event, SESEmailEvent)
+            assert event.model_dump() == SESEmailEvent(**kwargs).model_dump()
         assert len(files) > 0, "No files found in the data path"
 
 
@@ -2,7 +2,7 @@ import json
 import asyncio
 import pathlib
 import unittest
-from aws_tools.sns import SNSEventsTypes, SimpleNotificationService
+from aws_tools.sns import SNSEventsTypes, SimpleNotificationService, _SNSEvent
 from pydantic import TypeAdapter
 
 
@@ -13,9 +13,13 @@ data_path = pathlib.Path(__file__).parent / "data" / "SNS-events"
 
 class TestSNS(unittest.TestCase):
 
+    def test_event_types(self):
+        assert set(_SNSEvent.__subclasses__()) == set(SNSEventsTypes.__origin__.__args__)
+
     def test_list_files_in_data_path(self):
         files = list(data_path.glob("*"))
         files = [f for f in data_path.iterdir() if f.is_file() and f.suffix.lower() == ".json"]
+        bodies = []
         for file in files:
             with open(data_path / file, "r") as h:
                 payload = json.load(h)
@@ -23,7 +27,15 @@ class TestSNS(unittest.TestCase):
             async def test():
                 return await SimpleNotificationService.verify_sns_signature_async(body)
             assert asyncio.run(test())
+            bodies.append(body)
         assert len(files) > 0, "No files found in the data path"
+        async def test_batch():
+            return await SimpleNotificationService.verify_sns_signatures_async(bodies)
+        assert asyncio.run(test_batch()) == [True] * len(bodies)
+        unreachable = bodies[0].model_copy(update={"SigningCertURL": "https://sns.invalid-region-1.amazonaws.com/missing.pem"})
+        async def test_batch_with_unreachable_certificate():
+            return await SimpleNotificationService.verify_sns_signatures_async([unreachable] + bodies)
+        assert asyncio.run(test_batch_with_unreachable_certificate()) == [False] + [True] * len(bodies)
 
 
 if __name__ == "__main__":
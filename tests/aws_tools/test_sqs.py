@@ -0,0 +1,39 @@
+import unittest
+from pydantic import ValidationError
+from aws_tools.sqs import SQSMessageAttribute, SQSMessageResponse
+from aws_tools._check_fail_context import check_fail
+
+
+MESSAGE = {
+    "MessageId": "5fea7756-0ea4-451a-a703-a558b933e274",
+    "ReceiptHandle": "MbZj6wDWli+JvwwJaBV+3dcjk2YW2vA3+STFFljTM8tJJg6HRG6PYSasuWXPJB+Cw",
+    "MD5OfBody": "fafb00f5732ab283681e124bf8747ed1",
+    "Body": "This is a test message",
+    "Attributes": {"SenderId": "195004372649", "ApproximateReceiveCount": "1"},
+    "MD5OfMessageAttributes": "d25a6aea97eb8f585bfa92d314504a92",
+    "MessageAttributes": {
+        "City": {"DataType": "String", "StringValue": "Any City"},
+        "Payload": {"DataType": "Binary", "BinaryValue": b"\x00\x01"},
+    },
+}
+
+
+class TestSQS(unittest.TestCase):
+
+    def test_attribute_to_entry(self):
+        for entry in MESSAGE["MessageAttributes"].values():
+            assert SQSMessageAttribute(**entry).to_entry() == entry
+
+    def test_message_from_response(self):
+        message = SQSMessageResponse.from_response(MESSAGE)
+        assert message.model_dump() == SQSMessageResponse(**MESSAGE).model_dump()
+        assert message.model_dump(by_alias=True, exclude_defaults=True) == MESSAGE
+
+    def test_message_from_incomplete_response(self):
+        incomplete = {k: v for k, v in MESSAGE.items() if k != "ReceiptHandle"}
+        with check_fail(ValidationError):
+            SQSMessageResponse.from_response(incomplete)
+
+
+if __name__ == "__main__":
+    unittest.main()